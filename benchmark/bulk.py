@@ -0,0 +1,50 @@
+"""
+Compares converting array of values to members one by one with vectorized Enum.from_values().
+
+Requires numpy.
+"""
+import sys
+from enum import Enum, IntEnum
+from timeit import repeat
+
+import numpy as np
+
+import fastenum
+
+SIZE = 1_000_000
+
+
+def make_enum(base, count: int, step: int = 1):
+    return base('Generated', [(f'MEMBER_{i}', i * step) for i in range(count)])
+
+
+def best_time(func, repeats: int = 3) -> float:
+    return min(repeat(func, number=1, repeat=repeats))
+
+
+def compare(title: str, enum_class, values) -> None:
+    loop = best_time(lambda: [enum_class(v) for v in values.tolist()])
+    bulk = best_time(lambda: enum_class.from_values(values))
+    print(f'{title:<28} {loop:>10.4f} {bulk:>10.4f} {loop / bulk:>8.1f}x')
+
+
+def main(size: int = SIZE) -> None:
+    if not fastenum.enabled:
+        fastenum.enable()
+
+    rng = np.random.default_rng(0)
+    print(f'{size} values')
+    print(f'{"":<28} {"loop, s":>10} {"bulk, s":>10} {"speedup":>9}')
+
+    dense = make_enum(IntEnum, 100)
+    compare('dense int values', dense, rng.integers(0, 100, size))
+
+    sparse = make_enum(Enum, 100, step=1_000_003)
+    compare('sparse int values', sparse, rng.integers(0, 100, size) * 1_000_003)
+
+    strings = Enum('Generated', [(f'MEMBER_{i}', f'value_{i}') for i in range(100)])
+    compare('str values', strings, np.array([f'value_{i}' for i in rng.integers(0, 100, size)]))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else SIZE)
@@ -0,0 +1,50 @@
+"""
+Measures how enum class construction time scales with number of members.
+
+Time per member should stay roughly constant as enum grows,
+which means that construction is linear.
+Functional API is compared with fastenum.build_enum(), which skips per-key validation of class namespace.
+"""
+import sys
+from enum import Enum
+from timeit import repeat
+
+import fastenum
+
+MEMBER_COUNTS = (10, 100, 1000, 5000, 10000, 50000)
+
+
+def make_members(count: int):
+    return [(f'MEMBER_{i}', i) for i in range(count)]
+
+
+def construction_time(count: int, number: int = 1, repeats: int = 3) -> float:
+    members = make_members(count)
+    return min(repeat(lambda: Enum('Generated', members), number=number, repeat=repeats)) / number
+
+
+def build_time(count: int, number: int = 1, repeats: int = 3) -> float:
+    members = make_members(count)
+    return min(repeat(lambda: fastenum.build_enum('Generated', members), number=number, repeat=repeats)) / number
+
+
+def main(counts=MEMBER_COUNTS) -> None:
+    if not fastenum.enabled:
+        fastenum.enable()
+
+    print(f'{"members":>10} {"total, s":>12} {"per member, us":>16} {"ratio":>8} {"build_enum, s":>14} {"speedup":>8}')
+    first_per_member = None
+    for count in counts:
+        elapsed = construction_time(count)
+        built = build_time(count)
+        per_member = elapsed / count * 1e6
+        if first_per_member is None:
+            first_per_member = per_member
+        print(
+            f'{count:>10} {elapsed:>12.6f} {per_member:>16.3f} {per_member / first_per_member:>8.2f} '
+            f'{built:>14.6f} {elapsed / built:>8.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main(tuple(map(int, sys.argv[1:])) or MEMBER_COUNTS)
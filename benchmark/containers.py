@@ -0,0 +1,55 @@
+"""
+Compares EnumSet and EnumMap from fastenum.containers with builtin sets and dicts of members,
+for enums hashed by identity (plain Enum) and by value (str mixin).
+"""
+import sys
+from enum import Enum
+from timeit import repeat
+
+import fastenum
+from fastenum.containers import EnumMap, EnumSet
+
+SIZE = 64
+NUMBER = 100_000
+
+if not fastenum.enabled:
+    fastenum.enable()
+
+
+def best_time(stmt: str, namespace: dict, number: int = NUMBER) -> float:
+    return min(repeat(stmt, globals=namespace, number=number, repeat=5)) / number * 1e9
+
+
+def main(size: int = SIZE) -> None:
+    print(f'enums with {size} members, ns per operation')
+    print(f'{"enum":<10} {"operation":<12} {"builtin":>10} {"fastenum":>10}')
+    for enum_name, enum_class in (
+            ('Enum', Enum('Plain', [f'M{i}' for i in range(size)])),
+            ('str, Enum', Enum('Text', [(f'M{i}', f'value_{i}') for i in range(size)], type=str)),
+    ):
+        members = list(enum_class)
+        member = members[size // 2]
+        evens, odds = members[::2], members[1::2]
+        namespace = {
+            'member': member,
+            'set_a': set(evens), 'set_b': set(odds),
+            'enum_set_a': EnumSet(enum_class, evens), 'enum_set_b': EnumSet(enum_class, odds),
+            'dict_': dict.fromkeys(evens, 0), 'enum_map': EnumMap(enum_class, dict.fromkeys(evens, 0)),
+        }
+        for operation, builtin, containers in (
+                ('in set', 'member in set_a', 'member in enum_set_a'),
+                ('union', 'set_a | set_b', 'enum_set_a | enum_set_b'),
+                ('intersect', 'set_a & set_b', 'enum_set_a & enum_set_b'),
+                ('iterate', 'for _ in set_a: pass', 'for _ in enum_set_a: pass'),
+                ('map get', 'dict_.get(member)', 'enum_map.get(member)'),
+                ('map set', 'dict_[member] = 1', 'enum_map[member] = 1'),
+                ('in map', 'member in dict_', 'member in enum_map'),
+        ):
+            print(
+                f'{enum_name:<10} {operation:<12} '
+                f'{best_time(builtin, namespace):>10.0f} {best_time(containers, namespace):>10.0f}'
+            )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else SIZE)
@@ -0,0 +1,36 @@
+"""
+Measures how long fastenum.enable() takes depending on number of objects in the heap.
+
+With scan_heap=True every object tracked by gc is checked, so time grows with heap,
+otherwise only enum classes and class dicts are visited.
+"""
+import sys
+from timeit import repeat
+
+import fastenum
+
+HEAP_SIZES = (0, 100_000, 1_000_000, 3_000_000)
+
+
+def enable_time(scan_heap: bool, repeats: int = 3) -> float:
+    def enable():
+        fastenum.enable(scan_heap=scan_heap)
+        fastenum.disable()
+
+    return min(repeat(enable, number=1, repeat=repeats))
+
+
+def main(sizes=HEAP_SIZES) -> None:
+    if fastenum.enabled:
+        fastenum.disable()
+
+    print(f'{"heap objects":>14} {"registry, ms":>14} {"heap scan, ms":>14}')
+    for size in sizes:
+        # empty dicts are not tracked by gc, lists are
+        heap = [[] for _ in range(size)]
+        print(f'{size:>14} {enable_time(False) * 1e3:>14.2f} {enable_time(True) * 1e3:>14.2f}')
+        del heap
+
+
+if __name__ == '__main__':
+    main(tuple(map(int, sys.argv[1:])) or HEAP_SIZES)
@@ -0,0 +1,58 @@
+"""
+Compares encoding and decoding of JSON payloads with enum members using hooks from fastenum.encoding
+and the usual hand-written ones, that access .value and call enum class for each field.
+"""
+import json
+import sys
+from enum import Enum
+from timeit import repeat
+
+import fastenum
+from fastenum.encoding import default, object_hook
+
+SIZE = 100_000
+
+if not fastenum.enabled:
+    fastenum.enable()
+
+Status = Enum('Status', [(f'STATUS_{i}', f'status_{i}') for i in range(20)])
+Role = Enum('Role', [(f'ROLE_{i}', i) for i in range(10)])
+
+
+def generic_default(obj):
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f'Object of type {obj.__class__.__name__} is not JSON serializable')
+
+
+def generic_object_hook(obj):
+    if 'status' in obj:
+        obj['status'] = Status(obj['status'])
+    if 'roles' in obj:
+        obj['roles'] = [Role(value) for value in obj['roles']]
+    return obj
+
+
+def best_time(func, repeats: int = 3) -> float:
+    return min(repeat(func, number=1, repeat=repeats))
+
+
+def main(size: int = SIZE) -> None:
+    payload = [
+        {'id': i, 'status': Status(f'status_{i % 20}'), 'roles': [Role(i % 10), Role((i + 1) % 10)]}
+        for i in range(size)
+    ]
+    data = json.dumps(payload, default=default)
+    hook = object_hook({'status': Status, 'roles': [Role]})
+    assert json.loads(data, object_hook=hook) == json.loads(data, object_hook=generic_object_hook) == payload
+
+    print(f'{size} objects with 3 members each')
+    print(f'{"hooks":<10} {"dumps, s":>10} {"loads, s":>10}')
+    for name, default_, hook_ in (('generic', generic_default, generic_object_hook), ('fastenum', default, hook)):
+        dumps = best_time(lambda: json.dumps(payload, default=default_))
+        loads = best_time(lambda: json.loads(data, object_hook=hook_))
+        print(f'{name:<10} {dumps:>10.4f} {loads:>10.4f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else SIZE)
@@ -183,7 +183,7 @@ if __name__ == '__main__':
             "{obj}('unknown')",
             "{obj}('FOO')",
             '{obj}({obj}.FOO)',
-            "{obj}['FOO']"
+            "{obj}['FOO']",
         ),
         MISC=(
             'sys.getsizeof({obj})',
@@ -191,6 +191,10 @@ if __name__ == '__main__':
             'for member in {obj}: pass',
             'dir({obj})',
             'repr({obj})',
+            'repr({obj}.FOO)',
+            'str({obj}.FOO)',
+            "f'{{{obj}.FOO}}'",
+            "format({obj}.FOO, '>5')",
         )
     )
 
@@ -215,3 +219,18 @@ if __name__ == '__main__':
         print((calculate_difference(time_info)))
     print(f'\n\nTOTAL TIME:')
     print((calculate_difference(total_time_elapsed)))
+
+    # only patched enums have non-raising lookups, so they're compared with the usual idiom
+    # instead of other enums, and are not included in total time
+    print(f'\n\nNON-RAISING LOOKUPS (PatchedEnum only):')
+    test(
+        PatchedEnum,
+        expressions=(
+            "{obj}.get('unknown')",
+            "try:\n    {obj}('unknown')\nexcept ValueError:\n    pass",
+            "{obj}.get('FOO')",
+            "try:\n    {obj}('FOO')\nexcept ValueError:\n    pass",
+            "{obj}.has_value('unknown')",
+        ),
+        **globals()
+    )
@@ -0,0 +1,53 @@
+"""
+Compares pickling members by value (default) and by name, see fastenum.set_pickle_by().
+
+Two scenarios are measured: one list of many members, and many small pickles
+with one member each, like tasks sent to multiprocessing workers.
+"""
+import pickle
+import sys
+from enum import Enum
+from timeit import repeat
+
+import fastenum
+
+SIZE = 1_000_000
+MEMBERS = 1000
+MODES = ('value', 'name')
+
+if not fastenum.enabled:
+    fastenum.enable()
+
+# tuple values are what makes default pickles big
+Task = Enum('Task', [(f'TASK_{i}', (f'queue_{i % 10}', i, 'some description of the task')) for i in range(MEMBERS)])
+
+
+def best_time(func, repeats: int = 3) -> float:
+    return min(repeat(func, number=1, repeat=repeats))
+
+
+def main(size: int = SIZE) -> None:
+    members = [Task[f'TASK_{i % MEMBERS}'] for i in range(size)]
+    single = members[: size // 10]
+
+    print(f'{size} members in one list, {len(single)} pickles with one member each')
+    print(f'{"mode":<8} {"dumps, s":>10} {"loads, s":>10} {"bytes":>12} {"single dumps, s":>16} '
+          f'{"single loads, s":>16} {"bytes each":>11}')
+    for mode in MODES:
+        fastenum.set_pickle_by(Task, mode)
+        payload = pickle.dumps(members)
+        assert pickle.loads(payload) == members
+        payloads = [pickle.dumps(m) for m in single]
+
+        dumps = best_time(lambda: pickle.dumps(members))
+        loads = best_time(lambda: pickle.loads(payload))
+        single_dumps = best_time(lambda: [pickle.dumps(m) for m in single])
+        single_loads = best_time(lambda: [pickle.loads(p) for p in payloads])
+        print(
+            f'{mode:<8} {dumps:>10.4f} {loads:>10.4f} {len(payload):>12} {single_dumps:>16.4f} '
+            f'{single_loads:>16.4f} {len(payloads[-1]):>11}'
+        )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else SIZE)
@@ -0,0 +1,349 @@
+"""
+Benchmark suite that sweeps enum kind, type of values and number of members.
+
+Results are printed as a table and can be saved as JSON, which then can be used as a baseline:
+
+    python benchmark/suite.py --output before.json
+    python benchmark/suite.py --baseline before.json --threshold 0.1
+
+Cases that got slower than baseline by more than threshold are reported as regressions,
+exit code is 1 if there are any. Pass --stdlib to measure builtin enum without fastenum.
+
+With --memory, memory allocated per member (measured with tracemalloc) and size of member's __dict__
+are reported instead of time, --compact does the same for enums with _compact_ = True.
+"""
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+from enum import Enum, Flag, IntEnum, IntFlag
+from timeit import Timer
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import fastenum
+
+KINDS: Dict[str, type] = {'Enum': Enum, 'IntEnum': IntEnum, 'Flag': Flag, 'IntFlag': IntFlag}
+VALUE_TYPES = ('str', 'int', 'tuple', 'unhashable')
+MEMBER_COUNTS = (2, 10, 100, 1000, 10000, 100000)
+QUICK_MEMBER_COUNTS = (2, 100, 10000)
+
+# lookups by unhashable values are linear, and flags with many members have huge values
+MAX_MEMBERS = {'unhashable': 1000, 'Flag': 1000, 'IntFlag': 1000}
+
+
+class Case(NamedTuple):
+    kind: str
+    value_type: str
+    members: int
+    operation: str
+
+    @property
+    def key(self) -> str:
+        return f'{self.kind}/{self.value_type}/{self.members}/{self.operation}'
+
+
+class Result(NamedTuple):
+    case: Case
+    median: float
+    iqr: float
+    ops_per_sec: float
+    number: int
+    repeat: int
+
+    @property
+    def metric(self) -> float:
+        return self.median
+
+    def to_json(self) -> Dict[str, Any]:
+        return {**self.case._asdict(), **self._asdict(), 'case': self.case.key, 'metric': self.metric}
+
+
+class MemoryResult(NamedTuple):
+    case: Case
+    bytes_per_member: float
+    dict_bytes: float
+
+    @property
+    def metric(self) -> float:
+        return self.bytes_per_member
+
+    def to_json(self) -> Dict[str, Any]:
+        return {**self.case._asdict(), **self._asdict(), 'case': self.case.key, 'metric': self.metric}
+
+
+def make_value(kind: str, value_type: str, i: int) -> Any:
+    if kind in {'Flag', 'IntFlag'}:
+        return 1 << i
+    if value_type == 'str':
+        return f'value_{i}'
+    if value_type == 'int':
+        return i
+    if value_type == 'tuple':
+        return i, str(i)
+    if value_type == 'unhashable':
+        return [i]
+    raise ValueError(f'Unknown value type: {value_type!r}')
+
+
+def is_supported(kind: str, value_type: str, members: int) -> bool:
+    if kind != 'Enum' and value_type != 'int':
+        return False
+    return members <= min(MAX_MEMBERS.get(kind, members), MAX_MEMBERS.get(value_type, members))
+
+
+def get_operations(kind: str, value_type: str, members: int) -> Dict[str, Callable[[], Any]]:
+    """Returns functions to measure, enum class is created once for all of them except construction"""
+    definitions = [(f'MEMBER_{i}', make_value(kind, value_type, i)) for i in range(members)]
+    base = KINDS[kind]
+    enum_class = base('Generated', definitions)
+    # the last member is the worst case for any linear lookup
+    last_name, last_value = definitions[-1]
+    last_member = enum_class[last_name]
+    # routing tables keyed by members
+    members_list = list(enum_class)
+    table = dict.fromkeys(members_list)
+
+    operations = {
+        'construction': lambda: base('Generated', definitions),
+        'attribute': lambda: getattr(enum_class, last_name),
+        'by_name': lambda: enum_class[last_name],
+        'by_value': lambda: enum_class(last_value),
+        'by_member': lambda: enum_class(last_member),
+        'member_value': lambda: last_member.value,
+        'iteration': lambda: list(enum_class),
+        'contains': lambda: last_member in enum_class,
+        'repr': lambda: repr(last_member),
+        'dict_key': lambda: table[last_member],
+        'dict_build': lambda: dict.fromkeys(members_list),
+    }
+    if kind in {'Flag', 'IntFlag'}:
+        first_member = enum_class[definitions[0][0]]
+        operations['or'] = lambda: first_member | last_member
+        operations['invert'] = lambda: ~last_member
+        composite = first_member | last_member
+        operations['composite_repr'] = lambda: repr(composite)
+    return operations
+
+
+def get_base(kind: str, compact: bool) -> Any:
+    base = KINDS[kind]
+    if not compact:
+        return base
+    namespace = type(base).__prepare__(f'Compact{kind}', (base,))
+    namespace['_compact_'] = True
+    return type(base)(f'Compact{kind}', (base,), namespace)
+
+
+def average_dict_size(members: Iterable[Any]) -> float:
+    sizes = [sys.getsizeof(vars(member)) for member in members]
+    return sum(sizes) / len(sizes)
+
+
+def measure_memory(kind: str, value_type: str, members: int, compact: bool) -> List[MemoryResult]:
+    """Measures memory taken by members and, for flags, by pseudo-members"""
+    base = get_base(kind, compact)
+    definitions = [(f'MEMBER_{i}', make_value(kind, value_type, i)) for i in range(members)]
+    results = []
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        enum_class = base('Generated', definitions)
+        allocated = tracemalloc.get_traced_memory()[0] - before
+        results.append(MemoryResult(
+            Case(kind, value_type, members, 'members'), allocated / members, average_dict_size(enum_class)
+        ))
+
+        if kind in {'Flag', 'IntFlag'}:
+            # all combinations of up to 10 lowest bits, except ones that are named members
+            values = [v for v in range(1, 1 << min(members, 10)) if v & (v - 1)]
+            if values:
+                before = tracemalloc.get_traced_memory()[0]
+                pseudo_members = [enum_class(v) for v in values]
+                allocated = tracemalloc.get_traced_memory()[0] - before
+                results.append(MemoryResult(
+                    Case(kind, value_type, members, 'pseudo_members'),
+                    allocated / len(values),
+                    average_dict_size(pseudo_members),
+                ))
+    finally:
+        tracemalloc.stop()
+    return results
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def measure(case: Case, func: Callable[[], Any], repeat: int, min_time: float) -> Result:
+    timer = Timer(func)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(number, int(number * min_time / max(elapsed, 1e-9)))
+    timings = sorted(t / number for t in timer.repeat(repeat=repeat, number=number))
+    median = percentile(timings, 0.5)
+    return Result(
+        case=case,
+        median=median,
+        iqr=percentile(timings, 0.75) - percentile(timings, 0.25),
+        ops_per_sec=1 / median if median else float('inf'),
+        number=number,
+        repeat=repeat,
+    )
+
+
+def run(
+        kinds: Iterable[str],
+        value_types: Iterable[str],
+        member_counts: Iterable[int],
+        operations: Optional[Iterable[str]] = None,
+        repeat: int = 5,
+        min_time: float = 0.2,
+) -> List[Result]:
+    results = []
+    wanted_operations = set(operations) if operations else None
+    for kind in kinds:
+        for value_type in value_types:
+            for members in member_counts:
+                if not is_supported(kind, value_type, members):
+                    continue
+                for operation, func in get_operations(kind, value_type, members).items():
+                    if wanted_operations is not None and operation not in wanted_operations:
+                        continue
+                    result = measure(Case(kind, value_type, members, operation), func, repeat, min_time)
+                    print_result(result)
+                    results.append(result)
+    return results
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.3f} {unit}'
+    return f'{seconds / 1e-9:.1f} ns'
+
+
+def run_memory(
+        kinds: Iterable[str], value_types: Iterable[str], member_counts: Iterable[int], compact: bool
+) -> List[MemoryResult]:
+    results = []
+    for kind in kinds:
+        for value_type in value_types:
+            for members in member_counts:
+                if not is_supported(kind, value_type, members):
+                    continue
+                for result in measure_memory(kind, value_type, members, compact):
+                    print_memory_result(result)
+                    results.append(result)
+    return results
+
+
+def print_result(result: Result) -> None:
+    print(
+        f'{result.case.key:<42} {format_time(result.median):>12} '
+        f'± {format_time(result.iqr):>12} {result.ops_per_sec:>16,.0f} ops/s'
+    )
+
+
+def print_memory_result(result: MemoryResult) -> None:
+    print(
+        f'{result.case.key:<42} {result.bytes_per_member:>10.1f} bytes per member '
+        f'{result.dict_bytes:>10.1f} bytes per __dict__'
+    )
+
+
+def get_metadata(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        'python': sys.version,
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'fastenum': not args.stdlib,
+        'memory': args.memory,
+        'compact': args.compact,
+    }
+
+
+def save(path: str, results: List[Any], metadata: Dict[str, Any]) -> None:
+    with open(path, 'w') as f:
+        json.dump({'metadata': metadata, 'results': [r.to_json() for r in results]}, f, indent=2)
+
+
+def compare(
+        results: List[Any], baseline: Dict[str, Any], threshold: float
+) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]]]:
+    """Returns regressions and improvements as (case, ratio to baseline) pairs, lower metric is better"""
+    baseline_metrics = {r['case']: r['metric'] for r in baseline['results']}
+    regressions, improvements = [], []
+    for result in results:
+        baseline_metric = baseline_metrics.get(result.case.key)
+        if not baseline_metric:
+            continue
+        ratio = result.metric / baseline_metric
+        if ratio > 1 + threshold:
+            regressions.append((result.case.key, ratio))
+        elif ratio < 1 - threshold:
+            improvements.append((result.case.key, ratio))
+    return regressions, improvements
+
+
+def print_comparison(title: str, cases: List[Tuple[str, float]]) -> None:
+    print(f'\n{title}: {len(cases)}')
+    for key, ratio in sorted(cases, key=lambda item: item[1], reverse=True):
+        print(f'    {key:<42} x{ratio:.2f}')
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--kinds', nargs='+', choices=KINDS, default=list(KINDS))
+    parser.add_argument('--value-types', nargs='+', choices=VALUE_TYPES, default=list(VALUE_TYPES))
+    parser.add_argument('--members', nargs='+', type=int, help=f'default: {MEMBER_COUNTS}')
+    parser.add_argument('--operations', nargs='+', help='run only these operations')
+    parser.add_argument('--quick', action='store_true', help=f'use {QUICK_MEMBER_COUNTS} members and less repeats')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--stdlib', action='store_true', help='measure builtin enum without fastenum')
+    parser.add_argument('--memory', action='store_true', help='measure memory per member instead of time')
+    parser.add_argument('--compact', action='store_true', help='measure memory of enums with _compact_ = True')
+    parser.add_argument('--output', help='path to save results as JSON')
+    parser.add_argument('--baseline', help='path to JSON results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.1, help='allowed slowdown relative to baseline')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.stdlib and fastenum.enabled:
+        fastenum.disable()
+    elif not args.stdlib and not fastenum.enabled:
+        fastenum.enable()
+
+    member_counts = args.members or (QUICK_MEMBER_COUNTS if args.quick else MEMBER_COUNTS)
+    repeat = 3 if args.quick else args.repeat
+    min_time = 0.05 if args.quick else 0.2
+    results: List[Any]
+    if args.memory or args.compact:
+        if args.compact and args.stdlib:
+            raise SystemExit('--compact is only supported with fastenum')
+        args.memory = True
+        results = run_memory(args.kinds, args.value_types, member_counts, args.compact)
+    else:
+        results = run(args.kinds, args.value_types, member_counts, args.operations, repeat, min_time)
+
+    if args.output:
+        save(args.output, results, get_metadata(args))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions, improvements = compare(results, baseline, args.threshold)
+        print_comparison('Improvements', improvements)
+        print_comparison('Regressions', regressions)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Measures throughput of member lookups split between different numbers of threads.
+
+With GIL, throughput stays about the same regardless of number of threads, and shouldn't drop
+because of contention. On free-threaded builds (python3.13t and newer) lookups don't take any locks,
+so throughput should grow with number of threads, up to the number of CPU cores.
+"""
+import os
+import sys
+import sysconfig
+import threading
+import time
+from enum import Enum, Flag
+
+import fastenum
+
+TOTAL_LOOKUPS = 2_000_000
+THREAD_COUNTS = (1, 2, 4, 8)
+
+if not fastenum.enabled:
+    fastenum.enable()
+
+Color = Enum('Color', [(f'COLOR_{i}', i) for i in range(100)])
+Permission = Flag('Permission', [(f'PERMISSION_{i}', 1 << i) for i in range(8)])
+
+
+def lookups(count: int, barrier: threading.Barrier) -> None:
+    read, write = Permission.PERMISSION_0, Permission.PERMISSION_1
+    barrier.wait()
+    for i in range(count // 4):
+        Color(i % 100)
+        Color['COLOR_1'].value
+        read | write
+        Color.get(-1)
+
+
+def run(threads_count: int, total: int) -> float:
+    barrier = threading.Barrier(threads_count + 1)
+    threads = [threading.Thread(target=lookups, args=(total // threads_count, barrier)) for _ in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def gil_enabled() -> bool:
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled() if is_gil_enabled is not None else True
+
+
+def main(total: int = TOTAL_LOOKUPS) -> None:
+    free_threaded = bool(sysconfig.get_config_var('Py_GIL_DISABLED'))
+    print(f'Python {sys.version.split()[0]}, free-threaded build: {free_threaded}, GIL enabled: {gil_enabled()}, '
+          f'CPUs: {os.cpu_count()}')
+    print(f'{"threads":>8} {"seconds":>10} {"lookups/s":>14} {"speedup":>8}')
+    single = None
+    for threads_count in THREAD_COUNTS:
+        elapsed = min(run(threads_count, total) for _ in range(3))
+        single = single or elapsed
+        print(f'{threads_count:>8} {elapsed:>10.4f} {total / elapsed:>14,.0f} {single / elapsed:>8.2f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else TOTAL_LOOKUPS)
@@ -1,39 +1,88 @@
+import threading
+
 from fastenum import patches  # just to execute module
-from fastenum.parcher import Patch, InstancePatch
+from fastenum.builder import build_enum
+from fastenum.freezing import freeze
+from fastenum.parcher import Patch, InstancePatch, Swap
+from fastenum.patches import (
+    add_index,
+    missing_cache_info,
+    pseudo_member_cache_info,
+    reset_stats,
+    set_hit_counting,
+    set_missing_cache_size,
+    set_pickle_by,
+    set_pseudo_member_cache_size,
+    set_value_freezer,
+    stats,
+)
+from fastenum.tracing import trace
 
 assert patches, "Need to load this module"
 
 __all__ = (
+    'add_index',
+    'build_enum',
     'disable',
     'enable',
     'enabled',
+    'freeze',
+    'missing_cache_info',
+    'pseudo_member_cache_info',
+    'reset_stats',
+    'set_hit_counting',
+    'set_missing_cache_size',
+    'set_pickle_by',
+    'set_pseudo_member_cache_size',
+    'set_value_freezer',
+    'stats',
+    'trace',
 )
 
 enabled: bool = False
 
+# serializes enabling and disabling from different threads
+_lock = threading.RLock()
 
-def enable() -> None:
+
+def enable(scan_heap: bool = False) -> None:
     """
     Patches enum for best performance
+
+    Existing members and descriptors are found through enum classes and class dicts.
+    Pass scan_heap=True to look for them through all objects tracked by gc instead,
+    in case some of them are no longer referenced by their classes (slower on big heaps).
+
+    Patching is atomic for other threads: they see enum either original or fully patched.
+    Everything that takes time is done first, then all attributes are replaced in one step
+    that doesn't let other threads run in between. Calls of enable() and disable() are serialized.
     """
     global enabled
-    if enabled:
-        raise RuntimeError('Nothing to enable: patch is already applied')
-
+    with _lock:
+        if enabled:
+            raise RuntimeError('Nothing to enable: patch is already applied')
 
-    Patch.enable_patches()
-    InstancePatch.enable_patches()
-    enabled = True
+        swap = Swap()
+        Patch.enable_patches(scan_heap=scan_heap, swap=swap)
+        InstancePatch.enable_patches(scan_heap=scan_heap, swap=swap)
+        swap.commit()
+        enabled = True
 
 
 def disable() -> None:
     """
-    Restores enum to its origin state
+    Restores enum to its origin state, undoing patches in exact reverse order of enable()
+
+    Like enable(), it's atomic for other threads and serialized with other calls.
     """
     global enabled
-    if not enabled:
-        raise RuntimeError('Nothing to disable: patch was not applied previously')
+    with _lock:
+        if not enabled:
+            raise RuntimeError('Nothing to disable: patch was not applied previously')
 
-    Patch.disable_patches()
-    InstancePatch.disable_patches()
-    enabled = False
+        swap = Swap()
+        # in reverse order of enable()
+        InstancePatch.disable_patches(swap=swap)
+        Patch.disable_patches(swap=swap)
+        swap.commit()
+        enabled = False
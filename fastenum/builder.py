@@ -0,0 +1,106 @@
+"""
+Fast construction of big enums from data, e.g. database tables or config files.
+"""
+from __future__ import annotations
+import sys
+from collections.abc import Mapping
+from enum import Enum, _is_dunder, _is_sunder, _make_class_unpicklable, auto  # type: ignore
+
+from fastenum.patches import EnumDictPatch
+
+TYPE_CHECKING = False  # typing imports re, see fastenum.startup
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, Optional, Tuple, Type, Union
+
+RESERVED_NAMES = {'mro', ''}
+
+
+def build_enum(
+        name: str,
+        members: Union[Mapping[str, Any], Iterable[Tuple[str, Any]]],
+        *,
+        base: Type[Enum] = Enum,
+        type: Optional[type] = None,  # noqa: A002, same as in Enum functional API
+        namespace: Optional[Mapping[str, Any]] = None,
+        module: Optional[str] = None,
+        qualname: Optional[str] = None,
+) -> Any:
+    """
+    Creates enum class from mapping of member names to values, or from iterable of (name, value) pairs.
+
+    Unlike Enum functional API, members are not set one by one through class namespace,
+    so each value becomes a member as is, even if it's a function; auto() is not supported.
+    Other class attributes, such as methods, _lazy_ or _missing_, can be passed in namespace.
+
+    >>> Color = build_enum('Color', {'RED': 1, 'GREEN': 2}, namespace={'_lazy_': True})
+    """
+    if not EnumDictPatch.__enabled__:
+        raise RuntimeError('fastenum must be enabled to build enums')
+
+    metacls = base.__class__
+    bases = (base,) if type is None else (type, base)
+    classdict = metacls.__prepare__(name, bases)
+    for key, value in (namespace or {}).items():
+        classdict[key] = value
+
+    if isinstance(members, Mapping):
+        enum_members = dict(members)
+    else:
+        pairs = list(members)
+        enum_members = dict(pairs)
+        if len(enum_members) != len(pairs):
+            seen = set()
+            duplicate = next(n for n, _ in pairs if n in seen or seen.add(n))  # type: ignore
+            raise TypeError('Attempted to reuse key: %r' % duplicate)
+
+    _check_names(enum_members)
+
+    conflicts = enum_members.keys() & classdict.keys()
+    if conflicts:
+        raise TypeError('Members conflict with namespace: %r' % sorted(conflicts))
+
+    if _has_auto(enum_members.values()):
+        raise TypeError('auto() values are not supported, use Enum functional API instead')
+
+    # skipping _EnumDict.__setitem__, EnumMeta.__new__ only needs members in .members
+    classdict.members = enum_members
+    dict.update(classdict, enum_members)
+
+    # through type.__call__, so that __init__ of custom metaclass is called too
+    enum_class = metacls(name, bases, classdict)
+
+    if module is None:
+        try:
+            module = sys._getframe(1).f_globals['__name__']
+        except (AttributeError, ValueError, KeyError):
+            pass
+    if module is None:
+        _make_class_unpicklable(enum_class)
+    else:
+        enum_class.__module__ = module
+    if qualname is not None:
+        enum_class.__qualname__ = qualname
+
+    return enum_class
+
+
+def _check_names(enum_members: Dict[str, Any]) -> None:
+    try:
+        # sunder and dunder names are the only invalid ones that end with underscore,
+        # so usually all names can be checked at once
+        joined = '\0'.join(enum_members) + '\0'
+    except TypeError:
+        invalid_names = [name for name in enum_members if not isinstance(name, str)]
+    else:
+        if '_\0' not in joined and not enum_members.keys() & RESERVED_NAMES:
+            return
+        invalid_names = [
+            name for name in enum_members
+            if name in RESERVED_NAMES or _is_sunder(name) or _is_dunder(name)
+        ]
+    if invalid_names:
+        raise ValueError('Invalid enum member name: {0}'.format(','.join(map(repr, invalid_names))))
+
+
+def _has_auto(values: Iterable[Any]) -> bool:
+    return any(issubclass(value_type, auto) for value_type in set(map(type, values)))
@@ -0,0 +1,188 @@
+"""
+Vectorized conversion between arrays of values and enum members, requires numpy.
+
+numpy is imported on first conversion, so that importing fastenum doesn't load it.
+"""
+from __future__ import annotations
+from typing import Any, Iterable, Optional
+
+# int values are looked up directly by index, if span of values
+# is not much bigger than number of values
+DENSE_TABLE_MAX_SPAN_FACTOR = 4
+DENSE_TABLE_MIN_SPAN = 256
+
+
+class ValueIndex:
+    """Lookup structure for values of named members of one enum class"""
+
+    def __init__(self, enum_class: Any) -> None:
+        np = _numpy()
+        # values of unhashable members are kept in the list, since they can only be compared one by one
+        value2member, self.unhashable_values = {}, []
+        for member in enum_class._member_map_.values():
+            try:
+                value2member.setdefault(member._value_, member)
+            except TypeError:
+                self.unhashable_values.append(member._value_)
+        self.value2member = value2member
+        # taking the map after iteration, since lazy enums replace it once all members are created
+        self.member_map = enum_class._member_map_
+        self.size = len(self.member_map)
+
+        keys = list(value2member)
+        try:
+            values = np.array(keys)
+        except (ValueError, TypeError):
+            values = np.array([], dtype=object)
+        # values such as tuples can't be represented as one-dimensional array, and values of different types
+        # are converted to one type by numpy (e.g. 1 and 'a' to '1' and 'a'), so they are looked up one by one
+        typed = (
+            values.dtype != object and values.ndim == 1 and not self.unhashable_values
+            and _with_types(values.tolist()) == _with_types(keys)
+        )
+        self.values_dtype = values.dtype if typed else None
+        self.dense = False
+        self.members: Any = None
+        self.keys: Any = None
+        if self.values_dtype is None or not len(values):
+            return
+
+        members = np.empty(len(values), dtype=object)
+        members[:] = list(value2member.values())
+        if values.dtype.kind in 'iu':
+            low, high = int(values.min()), int(values.max())
+            span = high - low + 1
+            if span <= max(DENSE_TABLE_MAX_SPAN_FACTOR * len(values), DENSE_TABLE_MIN_SPAN):
+                self.dense = True
+                self.low = low
+                self.valid = np.zeros(span, dtype=bool)
+                self.valid[values - low] = True
+                self.members = np.empty(span, dtype=object)
+                self.members[values - low] = members
+                return
+
+        order = np.argsort(values, kind='stable')
+        self.keys = values[order]
+        self.members = members[order]
+
+    def contains(self, value: Any) -> bool:
+        """Tells whether value is a value of named member, without looking it up in arrays"""
+        try:
+            return value in self.value2member
+        except TypeError:
+            return value in self.unhashable_values
+
+    def is_actual(self, enum_class: Any) -> bool:
+        return enum_class._member_map_ is self.member_map and len(self.member_map) == self.size
+
+    def find(self, values: Any) -> tuple[Any, Any]:
+        """Returns mask of found values and positions of their members in self.members"""
+        np = _numpy()
+        if self.members is None or not _comparable(self.values_dtype, values.dtype):
+            return np.zeros(values.shape, dtype=bool), None
+
+        if self.dense:
+            positions = values.astype(np.int64, copy=False) - self.low
+            found = (positions >= 0) & (positions < len(self.valid))
+            found[found] = self.valid[positions[found]]
+            return found, positions
+
+        positions = np.searchsorted(self.keys, values)
+        positions[positions == len(self.keys)] = 0
+        found = self.keys[positions] == values
+        return found, positions
+
+
+def _with_types(values: list[Any]) -> list[tuple[type, Any]]:
+    return [(value.__class__, value) for value in values]
+
+
+def _as_array(values: Iterable[Any]) -> Any:
+    """Converts values to array, keeping them as objects if numpy would convert some of them to strings"""
+    np = _numpy()
+    if isinstance(values, np.ndarray):
+        return values
+    array = np.asarray(values)
+    if array.dtype.kind in 'US':
+        objects = np.asarray(values, dtype=object)
+        if not all(isinstance(value, (str, bytes)) for value in objects.flat):
+            return objects
+    return array
+
+
+def _comparable(index_dtype: Any, values_dtype: Any) -> bool:
+    if index_dtype.kind in 'iu':
+        return values_dtype.kind in 'iu'
+    return index_dtype.kind == values_dtype.kind
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('numpy is required for bulk conversion of enum values') from None
+    return numpy
+
+
+def get_index(enum_class: Any) -> ValueIndex:
+    index: Optional[ValueIndex] = enum_class.__dict__.get('_value_index_')
+    if index is None or not index.is_actual(enum_class):
+        index = ValueIndex(enum_class)
+        type.__setattr__(enum_class, '_value_index_', index)
+    return index
+
+
+def from_values(enum_class: Any, values: Iterable[Any]) -> Any:
+    """
+    Converts array of values to array of members.
+
+    Values that are not found among named members are converted one by one,
+    so pseudo-members of flags and _missing_ hook still work.
+    """
+    np = _numpy()
+    values = _as_array(values)
+    index = get_index(enum_class)
+    found, positions = index.find(values)
+
+    result = np.empty(values.shape, dtype=object)
+    if positions is not None:
+        result[found] = index.members[positions[found]]
+    missed = np.flatnonzero(~found)
+    if len(missed):
+        flat_result = result.reshape(-1)
+        for i, value in zip(missed, values.reshape(-1)[missed].tolist()):
+            flat_result[i] = enum_class(value)
+    return result
+
+
+def to_values(enum_class: Any, members: Iterable[Any]) -> Any:
+    """Converts sequence of members to array of their values"""
+    np = _numpy()
+    if not isinstance(members, (list, tuple)):
+        members = list(np.asarray(members, dtype=object).flat)
+    wrong_classes = set(map(type, members)) - {enum_class}
+    if wrong_classes:
+        raise TypeError(
+            f'{enum_class.__qualname__} members expected, got instances of: '
+            + ', '.join(sorted(cls.__qualname__ for cls in wrong_classes))
+        )
+    index = get_index(enum_class)
+    if index.values_dtype is not None:
+        return np.array([member._value_ for member in members], dtype=index.values_dtype)
+    # values are kept as they are, without converting them to one type or unpacking tuples into dimensions
+    result = np.empty(len(members), dtype=object)
+    for i, member in enumerate(members):
+        result[i] = member._value_
+    return result
+
+
+def valid_mask(enum_class: Any, values: Iterable[Any]) -> Any:
+    """Returns boolean array telling which values are values of named members"""
+    np = _numpy()
+    values = _as_array(values)
+    index = get_index(enum_class)
+    found, positions = index.find(values)
+    if positions is None:
+        # values can't be looked up in arrays of values
+        found = np.array([index.contains(value) for value in values.flat], dtype=bool).reshape(values.shape)
+    return found
@@ -0,0 +1,81 @@
+from __future__ import annotations
+from collections import OrderedDict, namedtuple
+
+TYPE_CHECKING = False  # typing imports re, see fastenum.startup
+if TYPE_CHECKING:
+    from typing import Any, Hashable
+
+CacheInfo = namedtuple('CacheInfo', ('hits', 'misses', 'evictions', 'maxsize', 'currsize'))
+
+
+class LRUCache:
+    """
+    Keeps at most `maxsize` most recently used items, evicting least recently used ones.
+
+    All operations are built on top of single OrderedDict calls,
+    so cache stays consistent when used from different threads.
+    """
+    __slots__ = ('maxsize', 'hits', 'misses', 'evictions', '_data')
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 0:
+            raise ValueError(f'maxsize must be non-negative, got {maxsize!r}')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = self._data[key]
+            self._data.move_to_end(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def setdefault(self, key: Hashable, value: Any) -> Any:
+        """Returns value that is already cached by the key, or caches and returns a new one"""
+        value = self._data.setdefault(key, value)
+        self._evict()
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._evict()
+
+    def _evict(self) -> None:
+        data = self._data
+        while len(data) > self.maxsize:
+            try:
+                data.popitem(last=False)
+            except KeyError:
+                # evicted by another thread
+                break
+            self.evictions += 1
+
+    def resize(self, maxsize: int) -> None:
+        if maxsize < 0:
+            raise ValueError(f'maxsize must be non-negative, got {maxsize!r}')
+        self.maxsize = maxsize
+        self._evict()
+
+    def items(self):
+        return self._data.items()
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._data))
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} {self.info()}>'
@@ -0,0 +1,258 @@
+"""
+Sets and mappings of members of one enum class, stored by ordinals of members instead of their hashes.
+"""
+from collections.abc import MutableMapping, MutableSet, Set
+from enum import EnumMeta
+from itertools import compress, repeat
+from operator import is_not
+from typing import Any, Iterable, Iterator, Mapping, Tuple, Union
+
+from fastenum.patches import _get_members, _get_ordinal
+
+
+def _ordinal(enum_class: EnumMeta, member: Any) -> int:
+    if member.__class__ is not enum_class:
+        raise TypeError(f'{member!r} is not a member of {enum_class.__qualname__}')
+    ordinal = _get_ordinal(enum_class, member)
+    if ordinal is None:
+        # pseudo-members of flags, or members of class created before fastenum was enabled
+        raise ValueError(f'{member!r} has no ordinal')
+    return ordinal
+
+
+# b'0' and b'1' to zero and one bytes
+_BINARY_DIGITS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+class EnumSet(MutableSet):
+    """
+    Set of members of one enum class, stored as bits of int by ordinals of members.
+
+    Iterates in definition order. Operators with other EnumSet of the same class are single int operations,
+    with other sets they fall back to generic ones, that only accept members of the same class.
+    """
+
+    __slots__ = ('enum_class', '_bits')
+
+    def __init__(self, enum_class: EnumMeta, members: Iterable[Any] = ()) -> None:
+        self.enum_class = enum_class
+        bits = 0
+        for member in members:
+            bits |= 1 << _ordinal(enum_class, member)
+        self._bits = bits
+
+    @classmethod
+    def all(cls, enum_class: EnumMeta) -> 'EnumSet':
+        """Returns set of all members of enum class"""
+        return cls._from_bits(enum_class, (1 << len(_get_members(enum_class))) - 1)
+
+    @classmethod
+    def _from_bits(cls, enum_class: EnumMeta, bits: int) -> 'EnumSet':
+        enum_set = cls.__new__(cls)
+        enum_set.enum_class = enum_class
+        enum_set._bits = bits
+        return enum_set
+
+    def _from_iterable(self, members: Iterable[Any]) -> 'EnumSet':
+        # used by operators of Set with other sets
+        return self.__class__(self.enum_class, members)
+
+    def __contains__(self, member: Any) -> bool:
+        if member.__class__ is not self.enum_class:
+            return False
+        ordinal = _get_ordinal(self.enum_class, member)
+        return ordinal is not None and self._bits >> ordinal & 1 == 1
+
+    def __iter__(self) -> Iterator[Any]:
+        # binary digits from the lowest one select members, without looping over bits in python
+        return compress(_get_members(self.enum_class), bin(self._bits)[:1:-1].encode().translate(_BINARY_DIGITS))
+
+    def __len__(self) -> int:
+        return bin(self._bits).count('1')
+
+    def __bool__(self) -> bool:
+        return self._bits != 0
+
+    def add(self, member: Any) -> None:
+        self._bits |= 1 << _ordinal(self.enum_class, member)
+
+    def discard(self, member: Any) -> None:
+        if member in self:
+            self._bits &= ~(1 << _get_ordinal(self.enum_class, member))
+
+    def clear(self) -> None:
+        self._bits = 0
+
+    def copy(self) -> 'EnumSet':
+        return self._from_bits(self.enum_class, self._bits)
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is self.__class__ and other.enum_class is self.enum_class:
+            return self._bits == other._bits
+        return Set.__eq__(self, other)
+
+    def __le__(self, other: Any) -> bool:
+        if other.__class__ is self.__class__ and other.enum_class is self.enum_class:
+            return self._bits & other._bits == self._bits
+        return Set.__le__(self, other)
+
+    def __ge__(self, other: Any) -> bool:
+        if other.__class__ is self.__class__ and other.enum_class is self.enum_class:
+            return self._bits & other._bits == other._bits
+        return Set.__ge__(self, other)
+
+    def __lt__(self, other: Any) -> bool:
+        if other.__class__ is self.__class__ and other.enum_class is self.enum_class:
+            return self._bits != other._bits and self._bits & other._bits == self._bits
+        return Set.__lt__(self, other)
+
+    def __gt__(self, other: Any) -> bool:
+        if other.__class__ is self.__class__ and other.enum_class is self.enum_class:
+            return self._bits != other._bits and self._bits & other._bits == other._bits
+        return Set.__gt__(self, other)
+
+    def __or__(self, other: Any) -> 'EnumSet':
+        if other.__class__ is self.__class__ and other.enum_class is self.enum_class:
+            return self._from_bits(self.enum_class, self._bits | other._bits)
+        return Set.__or__(self, other)
+
+    def __and__(self, other: Any) -> 'EnumSet':
+        if other.__class__ is self.__class__ and other.enum_class is self.enum_class:
+            return self._from_bits(self.enum_class, self._bits & other._bits)
+        return Set.__and__(self, other)
+
+    def __sub__(self, other: Any) -> 'EnumSet':
+        if other.__class__ is self.__class__ and other.enum_class is self.enum_class:
+            return self._from_bits(self.enum_class, self._bits & ~other._bits)
+        return Set.__sub__(self, other)
+
+    def __xor__(self, other: Any) -> 'EnumSet':
+        if other.__class__ is self.__class__ and other.enum_class is self.enum_class:
+            return self._from_bits(self.enum_class, self._bits ^ other._bits)
+        return Set.__xor__(self, other)
+
+    __ror__ = __or__
+    __rand__ = __and__
+    __rxor__ = __xor__
+
+    def __invert__(self) -> 'EnumSet':
+        """Returns set of members of enum class that are not in this set"""
+        return self._from_bits(self.enum_class, ~self._bits & EnumSet.all(self.enum_class)._bits)
+
+    def __ior__(self, other: Any) -> 'EnumSet':
+        if other.__class__ is self.__class__ and other.enum_class is self.enum_class:
+            self._bits |= other._bits
+            return self
+        return MutableSet.__ior__(self, other)
+
+    def __iand__(self, other: Any) -> 'EnumSet':
+        if other.__class__ is self.__class__ and other.enum_class is self.enum_class:
+            self._bits &= other._bits
+            return self
+        return MutableSet.__iand__(self, other)
+
+    def __isub__(self, other: Any) -> 'EnumSet':
+        if other.__class__ is self.__class__ and other.enum_class is self.enum_class:
+            self._bits &= ~other._bits
+            return self
+        return MutableSet.__isub__(self, other)
+
+    def __ixor__(self, other: Any) -> 'EnumSet':
+        if other.__class__ is self.__class__ and other.enum_class is self.enum_class:
+            self._bits ^= other._bits
+            return self
+        return MutableSet.__ixor__(self, other)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__, (self.enum_class, list(self))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.enum_class.__qualname__}, {list(self)!r})'
+
+
+# marks ordinals of members that are not in the map
+_EMPTY = object()
+
+
+class EnumMap(MutableMapping):
+    """
+    Mapping with members of one enum class as keys, that stores values in list by ordinals of members.
+
+    Iterates in definition order of members, regardless of order in which they were added.
+    """
+
+    __slots__ = ('enum_class', '_values', '_len')
+
+    def __init__(
+            self, enum_class: EnumMeta, items: Union[Mapping[Any, Any], Iterable[Tuple[Any, Any]]] = ()
+    ) -> None:
+        self.enum_class = enum_class
+        self._values = [_EMPTY] * len(_get_members(enum_class))
+        self._len = 0
+        self.update(items)
+
+    def __getitem__(self, member: Any) -> Any:
+        # members of other classes and other values are just missing keys, as for dicts
+        if member.__class__ is self.enum_class:
+            ordinal = _get_ordinal(self.enum_class, member)
+            if ordinal is not None:
+                value = self._values[ordinal]
+                if value is not _EMPTY:
+                    return value
+        raise KeyError(member)
+
+    def get(self, member: Any, default: Any = None) -> Any:
+        if member.__class__ is self.enum_class:
+            ordinal = _get_ordinal(self.enum_class, member)
+            if ordinal is not None:
+                value = self._values[ordinal]
+                if value is not _EMPTY:
+                    return value
+        return default
+
+    def __contains__(self, member: Any) -> bool:
+        if member.__class__ is not self.enum_class:
+            return False
+        ordinal = _get_ordinal(self.enum_class, member)
+        return ordinal is not None and self._values[ordinal] is not _EMPTY
+
+    def __setitem__(self, member: Any, value: Any) -> None:
+        ordinal = _ordinal(self.enum_class, member)
+        values = self._values
+        if values[ordinal] is _EMPTY:
+            self._len += 1
+        values[ordinal] = value
+
+    def __delitem__(self, member: Any) -> None:
+        # raises KeyError the same way as lookup
+        self[member]
+        self._values[_get_ordinal(self.enum_class, member)] = _EMPTY
+        self._len -= 1
+
+    def __iter__(self) -> Iterator[Any]:
+        return compress(_get_members(self.enum_class), map(is_not, self._values, repeat(_EMPTY)))
+
+    def __len__(self) -> int:
+        return self._len
+
+    def clear(self) -> None:
+        self._values = [_EMPTY] * len(self._values)
+        self._len = 0
+
+    def copy(self) -> 'EnumMap':
+        enum_map = self.__class__.__new__(self.__class__)
+        enum_map.enum_class = self.enum_class
+        enum_map._values = self._values.copy()
+        enum_map._len = self._len
+        return enum_map
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is self.__class__ and other.enum_class is self.enum_class:
+            return self._values == other._values
+        return MutableMapping.__eq__(self, other)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__, (self.enum_class, list(self.items()))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.enum_class.__qualname__}, {dict(self.items())!r})'
@@ -0,0 +1,89 @@
+"""
+Encoding enum members to JSON as their values, and converting decoded values back to members.
+"""
+import json
+from enum import EnumMeta
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Type, Union
+
+
+def default(obj: Any) -> Any:
+    """
+    Hook for json.dumps(..., default=default) that encodes members as their values.
+
+    Members of enums mixed with str or int are encoded by json itself and don't get here.
+    """
+    # members keep their values in __dict__, so no per-class table is needed to get them
+    if isinstance(obj.__class__, EnumMeta):
+        return obj._value_
+    raise TypeError(f'Object of type {obj.__class__.__name__} is not JSON serializable')
+
+
+class JSONEncoder(json.JSONEncoder):
+    """JSON encoder that encodes enum members as their values, subclasses can override default() for other types"""
+
+    def default(self, o: Any) -> Any:
+        if isinstance(o.__class__, EnumMeta):
+            return o._value_
+        return super().default(o)
+
+
+def to_members(enum_class: Any, values: Iterable[Any]) -> List[Any]:
+    """Converts values to members, the same as [enum_class(value) for value in values], but faster"""
+    if values.__class__ is not list:
+        # iterators can't be consumed twice
+        values = list(values)
+    value2member_map = enum_class._value2member_map_
+    try:
+        return [value2member_map[value] for value in values]
+    except (KeyError, TypeError):
+        # some values don't belong to named members or are unhashable
+        return [enum_class(value) for value in values]
+
+
+def _member_converter(enum_class: Any) -> Callable[[Any], Any]:
+    def convert(value: Any) -> Any:
+        try:
+            return enum_class._value2member_map_[value]
+        except (KeyError, TypeError):
+            # null is kept for optional fields
+            return None if value is None else enum_class(value)
+
+    return convert
+
+
+def _members_converter(enum_class: Any) -> Callable[[Any], Any]:
+    def convert(values: Any) -> Any:
+        return None if values is None else to_members(enum_class, values)
+
+    return convert
+
+
+def object_hook(
+        fields: Mapping[str, Union[Type[Any], List[Type[Any]]]],
+        base_hook: Optional[Callable[[Dict[str, Any]], Any]] = None,
+) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Returns hook for json.loads(..., object_hook=hook) that converts values of given fields to members.
+
+    Fields map keys to enum classes, or to lists with one enum class for keys that hold lists of values.
+    Fields are looked up by key in every decoded object, including nested ones; values that are
+    not found among members are converted by calling enum class, so ValueError is raised for invalid ones.
+    Objects are passed to base_hook, if given, after conversion.
+
+    >>> json.loads(data, object_hook=object_hook({'status': Status, 'roles': [Role]}))
+    """
+    converters = []
+    for key, enum_class in fields.items():
+        if isinstance(enum_class, list):
+            (enum_class,) = enum_class
+            converters.append((key, _members_converter(enum_class)))
+        else:
+            converters.append((key, _member_converter(enum_class)))
+
+    def hook(obj: Dict[str, Any]) -> Any:
+        for key, convert in converters:
+            if key in obj:
+                obj[key] = convert(obj[key])
+        return obj if base_hook is None else base_hook(obj)
+
+    return hook
@@ -0,0 +1,89 @@
+"""
+O(1) lookups of enum members by unhashable values, such as lists, dicts or dataclass instances.
+"""
+from __future__ import annotations
+import sys
+
+TYPE_CHECKING = False  # typing imports re, see fastenum.startup
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Optional
+
+# frozen lists, dicts and dataclasses are tagged, so they're never equal to frozen tuples or other hashable values
+_TAG = object()
+
+
+def freeze(value: Any) -> Any:
+    """
+    Returns hashable version of value, such that frozen values are equal only if original values are equal.
+
+    Hashable values are returned as is. Lists, tuples, dicts, sets, bytearrays and dataclass instances
+    are frozen recursively, TypeError is raised for other unhashable values.
+    Custom freezers can fall back to this function for values they don't handle themselves.
+    """
+    # exact types are checked first, since raising TypeError on hashing is slow
+    freezer = _FREEZERS.get(value.__class__)
+    if freezer is not None:
+        return freezer(value)
+    try:
+        hash(value)
+    except TypeError:
+        pass
+    else:
+        return value
+
+    for base, freezer in _FREEZERS.items():
+        if isinstance(value, base):
+            return freezer(value)
+    # there are no dataclass instances until dataclasses module is imported by someone else
+    dataclasses = sys.modules.get('dataclasses')
+    if dataclasses is not None and dataclasses.is_dataclass(value) and value.__dataclass_params__.eq:
+        # generated __eq__ compares fields of instances of the same class only
+        return _TAG, value.__class__, tuple(
+            [freeze(getattr(value, f.name)) for f in dataclasses.fields(value) if f.compare]
+        )
+    raise TypeError(f"can't freeze value of type {value.__class__.__qualname__!r}")
+
+
+_FREEZERS: Dict[type, Callable[[Any], Any]] = {
+    list: lambda value: (_TAG, list, tuple(map(freeze, value))),
+    # tuples of hashable values stay equal to themselves
+    tuple: lambda value: tuple(map(freeze, value)),
+    # keys are hashable already
+    dict: lambda value: (_TAG, dict, frozenset([(key, freeze(item)) for key, item in value.items()])),
+    # the same as original value, since set({1}) == frozenset({1})
+    set: frozenset,
+    bytearray: bytes,
+}
+
+
+class FrozenValueIndex:
+    """Mapping of frozen values of members of one enum class to members"""
+
+    def __init__(self, freezer: Callable[[Any], Any]) -> None:
+        self.freezer = freezer
+        self.members: Dict[Any, Any] = {}
+        # members with values that freezer can't handle
+        self.unfrozen: List[Any] = []
+
+    def add(self, member: Any) -> None:
+        try:
+            # the same as with hashable values, first member wins
+            self.members.setdefault(self.freezer(member._value_), member)
+        except TypeError:
+            self.unfrozen.append(member)
+
+    def find(self, value: Any, all_members: Any) -> Optional[Any]:
+        """Returns member with value equal to given one, or None"""
+        try:
+            member = self.members.get(self.freezer(value))
+        except TypeError:
+            # value can't be frozen, so it can be equal to any member
+            candidates = all_members
+        else:
+            if member is not None:
+                return member
+            candidates = self.unfrozen
+        for member in candidates:
+            if member._value_ == value:
+                return member
+        return None
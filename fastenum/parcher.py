@@ -1,6 +1,11 @@
 from __future__ import annotations
 import gc
-from typing import MutableMapping, Any, AbstractSet, Type, Callable, Dict, Tuple, Mapping, Optional, Set, cast
+from collections import deque
+from functools import partial
+
+TYPE_CHECKING = False  # typing imports re, see fastenum.startup
+if TYPE_CHECKING:
+    from typing import Any, AbstractSet, Type, Callable, Dict, Iterable, Tuple, Mapping, Optional, Set
 
 
 class _Missing:
@@ -11,43 +16,91 @@ class _Missing:
 MISSING = _Missing()
 
 
-def get_attr(t: Any, name: str, default: Optional[Any] = MISSING) -> Any:
-    value = t.__dict__.get(name, default)
-    if value is not get_attr:
-        if hasattr(value, '__get__') and type(value) in {staticmethod, classmethod}:
-            return getattr(t, name, get_attr)
+def _resolve(t: Any, value: Any) -> Any:
+    # static and class methods are compared by what they return, the same way getattr() would do
+    if type(value) in {staticmethod, classmethod}:
+        return value.__get__(None, t)
+    return value
+
+
+class Swap:
+    """
+    Attribute changes of one or more patches, made all at once by commit().
+
+    Everything that runs Python code (looking for subclasses and instances, running hooks)
+    is done while changes are collected. commit() then makes them with C calls only,
+    so other threads, which may only take over in between bytecodes,
+    see either all attributes original or all of them patched.
+    """
+
+    def __init__(self) -> None:
+        self._changes: list[partial] = []
+        # raw values attributes will have once collected changes are made
+        self._pending: dict[Tuple[int, str], Any] = {}
+        self._callbacks: list[Callable[[], None]] = []
+
+    def get(self, t: Any, name: str) -> Any:
+        """Returns raw value of attribute in t's own dict, as it will be after collected changes"""
+        return self._pending.get((id(t), name), t.__dict__.get(name, MISSING))
+
+    def get_resolved(self, t: Any, name: str) -> Any:
+        return _resolve(t, self.get(t, name))
+
+    def set(self, t: Any, name: str, value: Any) -> None:
+        if type(t.__dict__) is dict:
+            self._changes.append(partial(dict.__setitem__, t.__dict__, name, value))
+        else:
+            # EnumMeta.__setattr__ is written in Python, type's one is used instead
+            self._changes.append(partial(type.__setattr__, t, name, value))
+        self._pending[id(t), name] = value
+
+    def delete(self, t: Any, name: str) -> None:
+        if self.get(t, name) is MISSING:
+            return
+        if type(t.__dict__) is dict:
+            self._changes.append(partial(dict.__delitem__, t.__dict__, name))
         else:
-            return value
-    return getattr(t, name, get_attr)
+            self._changes.append(partial(type.__delattr__, t, name))
+        self._pending[id(t), name] = MISSING
 
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        self._callbacks.append(callback)
 
-def del_attr(t: Any, name: str) -> Any:
-    old = get_attr(t, name, MISSING)
-    if old is not MISSING:
-        delattr(t, name)
-    return old
+    def commit(self) -> None:
+        changes, self._changes = self._changes, []
+        gc_enabled = gc.isenabled()
+        # collection may call finalizers written in Python, which would let other threads in
+        gc.disable()
+        try:
+            # map() and deque() run the loop in C, without returning to the interpreter in between changes
+            deque(map(partial.__call__, changes), maxlen=0)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self._pending.clear()
+
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
 
 
-def set_attr(t: Any, name: str, value: Any) -> Any:
-    old = get_attr(t, name)
-    if isinstance(t.__dict__, MutableMapping):
-        t.__dict__[name] = value
-    else:
-        setattr(t, name, value)
-    return old
+def _is_method(value: Any) -> bool:
+    # functions, class and static methods, properties
+    return hasattr(value, '__get__')
 
 
 class PatchMeta(type):
     __enabled__: bool
     __run_on_class__: classmethod
     __run_on_instance__: classmethod
+    __collect_instances__: classmethod
 
     __target__: Type[Any]
     __to_update__: dict[str, Any]
     __to_delete__: AbstractSet[str]
     __original_attrs__: dict[Any, Any]
-    __extra__: AbstractSet[str]
-    __redefined_on_subclasses__: dict[str, Any]
+    __redefined_on_subclasses__: dict[str, dict[Type[Any], Any]]
+    __applied__: list[str]
 
     def __prepare__(cls, *args: Any, **kwargs: Any) -> Mapping[str, Any]:  # type: ignore
         return type.__prepare__(*args, **kwargs)
@@ -65,14 +118,15 @@ class PatchMeta(type):
         if target is None:
             return type.__new__(mcs, name, bases, namespace)
 
-        to_delete = cast(set, delete or namespace.pop('__to_delete__', set()))
-        to_update = cast(set, update or namespace.pop('__to_update__', set()))
+        to_delete: set = delete or namespace.pop('__to_delete__', set())
+        to_update: set = update or namespace.pop('__to_update__', set())
 
+        # data attributes are set before methods that may use them, and removed after them
         patched_attrs = {
             attr: namespace[attr]
-            for attr in to_update
+            for attr in sorted(to_update, key=lambda attr: _is_method(namespace[attr]))
         }
-        
+
         original_attrs = {
             attr: target.__dict__[attr]
             for attr in to_update | to_delete
@@ -83,13 +137,15 @@ class PatchMeta(type):
         cls.__target__ = target
         cls.__to_update__ = patched_attrs
         cls.__original_attrs__ = original_attrs
-        cls.__extra__ = (to_update | to_delete) ^ original_attrs.keys()
         cls.__to_delete__ = to_delete
         cls.__redefined_on_subclasses__ = {}
+        # attributes in order they were changed by enable(), disable() restores them in reverse order
+        cls.__applied__ = []
         cls.__enabled__ = False
         return cls
 
-    def enable(cls, check: bool = True) -> None:
+    def enable(cls, check: bool = True, scan_heap: bool = False, swap: Optional[Swap] = None) -> None:
+        """Applies the patch, or adds its changes to swap, to be applied together with others on swap.commit()"""
         if check and cls.__enabled__:
             raise RuntimeError(f"{cls} is already enabled")
 
@@ -97,69 +153,123 @@ class PatchMeta(type):
             target = cls.__target__
         except AttributeError:
             raise TypeError("This patch doesn't have a target. You should define it on its subclass")
+        own_swap = swap is None
+        swap = swap or Swap()
         subclasses = cls._get_all_subclasses(target)
+        cls._run_hooks(target, subclasses, scan_heap, on_target=True)
 
-        if cls.__run_on_class__:
-            cls.__run_on_class__(target)
-            for sub_cls in subclasses:
-                cls.__run_on_class__(sub_cls)
-
-        if cls.__run_on_instance__:
-            for obj in gc.get_objects():
-                if isinstance(obj, target):
-                    cls.__run_on_instance__(obj)
-
+        applied = cls.__applied__ = []
         for attr in cls.__to_delete__:
-            old_value = del_attr(target, attr)
+            old_value = swap.get_resolved(target, attr)
             if old_value is MISSING:
                 continue
+            swap.delete(target, attr)
+            applied.append(attr)
             for sub_cls in subclasses:
-                if get_attr(sub_cls, attr) is old_value:
-                    del_attr(sub_cls, attr)
-                    cls.__redefined_on_subclasses__.setdefault(attr, set()).add(sub_cls)
+                if swap.get_resolved(sub_cls, attr) is old_value:
+                    cls.__redefined_on_subclasses__.setdefault(attr, {})[sub_cls] = swap.get(sub_cls, attr)
+                    swap.delete(sub_cls, attr)
 
         for attr, new_value in cls.__to_update__.items():
-            old_value = set_attr(target, attr, new_value)
+            # resolved value is compared with subclasses, raw value is needed to restore it later
+            original_value = swap.get(target, attr)
+            old_value = _resolve(target, original_value)
+            swap.set(target, attr, new_value)
+            applied.append(attr)
             if old_value is MISSING:
                 continue
-            cls.__original_attrs__[attr] = old_value
+            cls.__original_attrs__[attr] = original_value
             for sub_cls in subclasses:
-                if get_attr(sub_cls, attr) is old_value:
-                    set_attr(sub_cls, attr, new_value)
-                    cls.__redefined_on_subclasses__.setdefault(attr, set()).add(sub_cls)
+                if swap.get_resolved(sub_cls, attr) is old_value:
+                    cls.__redefined_on_subclasses__.setdefault(attr, {})[sub_cls] = swap.get(sub_cls, attr)
+                    swap.set(sub_cls, attr, new_value)
+
+        swap.after_commit(lambda: cls._finish_enable(subclasses, scan_heap))
+        if own_swap:
+            swap.commit()
 
+    def _finish_enable(cls, subclasses: Set[Type[Any]], scan_heap: bool) -> None:
         cls.__enabled__ = True
+        # classes defined by other threads while changes were collected weren't seen by hooks
+        new_subclasses = cls._get_all_subclasses(cls.__target__) - subclasses
+        if new_subclasses:
+            cls._run_hooks(cls.__target__, new_subclasses, scan_heap, on_target=False)
+
+    def _run_hooks(cls, target: Any, subclasses: Set[Type[Any]], scan_heap: bool, on_target: bool) -> None:
+        if cls.__run_on_class__:
+            if on_target:
+                cls.__run_on_class__(target)
+            for sub_cls in subclasses:
+                cls.__run_on_class__(sub_cls)
+
+        if cls.__run_on_instance__:
+            for obj in cls._get_instances(target, subclasses, scan_heap):
+                cls.__run_on_instance__(obj)
 
-    def disable(cls, check: bool = True) -> None:
+    def disable(cls, check: bool = True, swap: Optional[Swap] = None) -> None:
+        """Restores the patched target, or adds changes that restore it to swap"""
         if check and not cls.__enabled__:
             raise RuntimeError(f"{cls} is already disabled")
 
+        own_swap = swap is None
+        swap = swap or Swap()
         target = cls.__target__
-        for attr, value in cls.__original_attrs__.items():
-            set_attr(target, attr, value)
-            for sub_cls in cls.__redefined_on_subclasses__.get(attr, ()):
-                set_attr(sub_cls, attr, value)
-
-        for attr in cls.__extra__:
-            del_attr(target, attr)
-
-        cls.__enabled__ = False
-
-    def enable_patches(cls, check: bool = True) -> None:
-        """This method is used to apply all defined patches"""
+        # exact reverse of enable(), so that patched methods never miss attributes they use
+        for attr in reversed(cls.__applied__):
+            value = cls.__original_attrs__.get(attr, MISSING)
+            if value is MISSING:
+                # added by the patch, or inherited by target before it
+                swap.delete(target, attr)
+            else:
+                swap.set(target, attr, value)
+            # subclasses get back their own raw values, or inherit them again
+            for sub_cls, value in cls.__redefined_on_subclasses__.pop(attr, {}).items():
+                if value is MISSING:
+                    swap.delete(sub_cls, attr)
+                else:
+                    swap.set(sub_cls, attr, value)
+
+        swap.after_commit(lambda: setattr(cls, '__enabled__', False))
+        if own_swap:
+            swap.commit()
+
+    def enable_patches(cls, check: bool = True, scan_heap: bool = False, swap: Optional[Swap] = None) -> None:
+        """This method is used to apply all defined patches at once"""
         if hasattr(cls, '__target__'):
             raise TypeError('To apply one particular patch, use .enable() method.')
 
+        own_swap = swap is None
+        swap = swap or Swap()
         for patch in cls.__subclasses__():
-            patch.enable(check)
+            patch.enable(check, scan_heap, swap)
+        if own_swap:
+            swap.commit()
 
-    def disable_patches(cls, check: bool = True) -> None:
-        """This method is used to disable all defined patches"""
+    def disable_patches(cls, check: bool = True, swap: Optional[Swap] = None) -> None:
+        """This method is used to disable all defined patches at once"""
         if hasattr(cls, '__target__'):
             raise TypeError('To apply one particular patch, use .enable() method.')
 
-        for patch in cls.__subclasses__():
-            patch.disable(check)
+        own_swap = swap is None
+        swap = swap or Swap()
+        # in reverse order, since later patches may rely on earlier ones
+        for patch in reversed(cls.__subclasses__()):
+            patch.disable(check, swap)
+        if own_swap:
+            swap.commit()
+
+    def _get_instances(cls, target: Any, subclasses: Set[Type[Any]], scan_heap: bool) -> Iterable[Any]:
+        """
+        Returns instances of target found by __collect_instances__ hook.
+
+        Walking whole heap is slow and gets slower as heap grows,
+        so it's only done when patch can't find its instances itself, or when explicitly asked to.
+        """
+        if scan_heap or cls.__collect_instances__ is None:
+            return [obj for obj in gc.get_objects() if isinstance(obj, target)]
+
+        # same instance may be reachable in many ways
+        return {id(obj): obj for obj in cls.__collect_instances__(target, subclasses)}.values()
 
     def _get_all_subclasses(cls, target: Type[Any]) -> Set[Type[Any]]:
         all_subclasses = set()
@@ -176,6 +286,8 @@ class Patch(metaclass=PatchMeta):
 
     __run_on_class__: Callable[[Type[Any]], None] | None = None
     __run_on_instance__: Callable[[Any], None] | None = None
+    # returns all existing instances of target, given target and its subclasses
+    __collect_instances__: Callable[[Type[Any], Set[Type[Any]]], Iterable[Any]] | None = None
 
 
 class InstancePatchMeta(PatchMeta):
@@ -185,7 +297,7 @@ class InstancePatchMeta(PatchMeta):
     def new(
             cls, target: Any, delete: AbstractSet[str] = None, update: Dict[str, Any] = None
     ) -> InstancePatchMeta:
-        return cast(InstancePatchMeta, cls.__class__.__new__(
+        return cls.__class__.__new__(  # type: ignore
             mcs=cls.__class__,
             name=getattr(target, '__name__', target.__class__.__name__) + 'Patch',
             bases=(cls,),
@@ -193,9 +305,10 @@ class InstancePatchMeta(PatchMeta):
             target=target,
             delete=delete,
             update=update.keys() if update else None,
-        ))
+        )
 
 
 class InstancePatch(metaclass=InstancePatchMeta):
     __run_on_class__ = None
     __run_on_instance__ = None
+    __collect_instances__ = None
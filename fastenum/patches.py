@@ -1,7 +1,12 @@
 import enum
+import sys
+import threading
+from collections import namedtuple
 from enum import ( # type: ignore
     Enum,
     EnumMeta,
+    Flag,
+    IntFlag,
     _EnumDict,
     auto,
     _auto_null,
@@ -11,10 +16,24 @@ from enum import ( # type: ignore
     _is_sunder,
     _make_class_unpicklable,
 )
+from operator import attrgetter
+from time import perf_counter
 from types import DynamicClassAttribute
 
-from fastenum.parcher import Patch, InstancePatch
+from fastenum.cache import LRUCache
+from fastenum.freezing import FrozenValueIndex, freeze
+from fastenum.parcher import MISSING, Patch, InstancePatch
 
+# name of class in errors, as stdlib enum of running version renders it
+_error_class_name = attrgetter('__qualname__' if sys.version_info >= (3, 9) else '__name__')
+
+# sunder names allowed in enum class body, including ones that configure fastenum features
+SUNDER_NAMES = {
+    '_order_', '_create_pseudo_member_',
+    '_generate_next_value_', '_missing_', '_ignore_',
+    '_lazy_', '_pseudo_member_cache_size_', '_compact_', '_pickle_by_', '_missing_cache_size_',
+    '_indexes_', '_value_freezer_',
+}
 
 class DynamicClassAttributePatch(
     Patch, target=DynamicClassAttribute, update={'__init__', '__get__', '__set_name__', 'set_class_attr'}
@@ -52,40 +71,83 @@ class DynamicClassAttributePatch(
     def __run_on_instance__(cls, instance):
         instance.alias = f'_cls_attr_{instance.fget.__name__}'
 
+    @classmethod
+    def __collect_instances__(cls, target, subclasses):
+        # descriptors only work from class dicts, so there's no need to look anywhere else
+        for klass in _iter_all_classes():
+            for value in list(klass.__dict__.values()):
+                if isinstance(value, target):
+                    yield value
+
+
+def _iter_all_classes():
+    seen = set()
+    stack = [object]
+    while stack:
+        klass = stack.pop()
+        if klass in seen:
+            continue
+        seen.add(klass)
+        yield klass
+        # klass.__subclasses__ would be unbound method for metaclasses
+        stack.extend(type.__subclasses__(klass))
+
 
 class EnumPatch(
     Patch,
     target=Enum,
     delete={'name', 'value'},
-    update={'__new__', '__setattr__', '__delattr__', '__dir__'},
+    update={
+        '__new__', '__setattr__', '__delattr__', '__dir__', '__repr__', '__str__', '__format__', '_missing_cache_',
+        '_ordinal_',
+    },
 ):
+    # bounded cache of _missing_ results, see set_missing_cache_size()
+    _missing_cache_ = None
+
     def __new__(cls, value):
         # all enum instances are actually created during class construction
         # without calling this method; this method is called by the metaclass'
         # __call__ (i.e. Color(3) ), and by pickle
 
         # using .__class__ instead of type() as it 2x faster
+        # lookups that get here missed the fast path in EnumMeta.__call__, and are counted separately;
+        # every class has own counters (see _get_counters()), they're read only on branches that count
         if value.__class__ is cls:
             # For lookups like Color(Color.RED)
+            if _count_hits:
+                cls._counters_.new_hits += 1
             return value
         # by-value search for a matching enum member
         # see if it's in the reverse mapping (for hashable values)
         try:
-            return cls._value2member_map_[value]
+            member = cls._value2member_map_[value]
         except KeyError:
             # Not found, no need to do long O(n) search
             pass
         except TypeError:
-            # not there, now do long search -- O(n) behavior
-            for member in cls._unique_member_map_.values():
-                if member.value == value:
-                    return member
+            # not there, now do long search -- O(n) behavior, unless class has index of frozen values
+            cls._counters_.linear_scans += 1
+            member = _find_unhashable(cls, value)
+            if member is not None:
+                return member
+        else:
+            if _count_hits:
+                cls._counters_.new_hits += 1
+            return member
         # still not found -- try _missing_ hook
 
         # TODO: Maybe remove try/except block and setting __context__ in this case?
         try:
-            result = cls._missing_(value)
+            # classes created while patch was enabled keep this __new__ after it's disabled
+            missing_cache = getattr(cls, '_missing_cache_', None)
+            if missing_cache is None:
+                cls._counters_.missing_calls += 1
+                result = cls._missing_(value)
+            else:
+                result = _call_missing_cached(cls, missing_cache, value)
         except Exception as e:
+            cls._counters_.missing_misses += 1
             if cls._missing_ is Enum._missing_:
                 # assuming Enum._missing_ is always raises exception
                 # This gives huge boost for standard enum
@@ -97,6 +159,7 @@ class EnumPatch(
         if isinstance(result, cls):
             return result
 
+        cls._counters_.missing_misses += 1
         ve_exc = ValueError("%r is not a valid %s" % (value, cls.__qualname__))
         if result is None:
             try:
@@ -123,10 +186,52 @@ class EnumPatch(
         ] + [m for m in self.__dict__ if m[0] != '_']
         return ['__class__', '__doc__', '__module__', 'name', 'value'] + added_behavior
 
+    # renderings are cached by value in each class, unless some values are unhashable,
+    # see _reset_string_caches()
+
+    def __repr__(self):
+        cache = self._repr_cache_
+        if cache is None:
+            return _enum_repr(self)
+        try:
+            return cache[self._value_]
+        except (KeyError, TypeError):
+            return _remember_string(self, cache, _enum_repr(self))
+
+    def __str__(self):
+        cache = self._str_cache_
+        if cache is None:
+            return _enum_str(self)
+        try:
+            return cache[self._value_]
+        except (KeyError, TypeError):
+            return _remember_string(self, cache, _enum_str(self))
+
+    def __format__(self, format_spec):
+        cache = self._format_cache_
+        if format_spec or cache is None:
+            return _enum_format(self, format_spec)
+        try:
+            return cache[self._value_]
+        except (KeyError, TypeError):
+            text = _enum_format(self, format_spec)
+            if self.__class__.__str__ not in {Enum.__str__, Flag.__str__}:
+                # overridden __str__ may return anything
+                return text
+            return _remember_string(self, cache, text)
+
+    @property
+    def _ordinal_(self):
+        # index in definition order, None for pseudo-members
+        return _get_ordinal(self.__class__, self)
+
     def __setattr__(self, key, value):
         if key in {'name', 'value'}:
             raise AttributeError("Can't set attribute")
         elif key in {'_name_', '_value_'}:
+            if key in self.__dict__:
+                # renamed member, renderings of flags containing it are outdated as well
+                _clear_string_caches(self.__class__)
             # hook to also set 'value' and 'name' attr
             object.__setattr__(self, key[1:-1], value)
         object.__setattr__(self, key, value)
@@ -138,14 +243,28 @@ class EnumPatch(
 
     @classmethod
     def __run_on_class__(cls, enum_cls: EnumMeta):  # type: ignore
+        # own counters of each class, so fast paths don't need to check for them
+        _get_counters(enum_cls)
         cls._set_names(enum_cls)
+        _set_member_sequences(enum_cls)
         cls._set_dynamic_class_attrs(enum_cls)
+        _reset_string_caches(enum_cls)
 
     @classmethod
     def __run_on_instance__(cls, member: Enum):  # type: ignore
         member.__dict__['name'] = member._name_
         member.__dict__['value'] = member._value_
 
+    @classmethod
+    def __collect_instances__(cls, target, subclasses):
+        for enum_cls in (target, *subclasses):
+            # dict methods are used to avoid creating members of lazy enums
+            yield from dict.values(enum_cls._member_map_)
+            yield from dict.values(enum_cls._value2member_map_)
+            pseudo_members = enum_cls.__dict__.get('_pseudo_members_')
+            if pseudo_members is not None:
+                yield from (member for _, member in pseudo_members.items())
+
     @classmethod
     def _set_names(cls, enum_cls):
         unique_members = set(enum_cls._member_names_)
@@ -157,15 +276,11 @@ class EnumPatch(
 
     @classmethod
     def _set_dynamic_class_attrs(cls, enum_cls):
-        assert DynamicClassAttributePatch.__enabled__, 'DynamicClassAttr must be patched first'
-        assert not EnumMetaPatch.__enabled__, 'EnumMetaPatch.__getattr__ method is needed for retrieving class attrs'
-
+        # runs before any patch is applied, so patched DynamicClassAttribute method is called directly,
+        # and members are taken from _member_map_, the same place EnumMeta.__getattr__ takes them from
         for k, v in enum_cls.__dict__.items():
-            if isinstance(v, DynamicClassAttribute):
-                try:
-                    v.set_class_attr(enum_cls, getattr(enum_cls, k))
-                except AttributeError:
-                    pass
+            if isinstance(v, DynamicClassAttribute) and k in enum_cls._member_map_:
+                DynamicClassAttributePatch.set_class_attr(v, enum_cls, enum_cls._member_map_[k])
 
 
 class EnumDictPatch(
@@ -195,10 +310,7 @@ class EnumDictPatch(
                     DeprecationWarning,
                     stacklevel=2,
                     )
-            if key not in {
-                '_order_', '_create_pseudo_member_',
-                '_generate_next_value_', '_missing_', '_ignore_',
-            }:
+            if key not in SUNDER_NAMES:
                 raise ValueError('_names_ are reserved for future Enum use')
             if key == '_generate_next_value_':
                 # check if members already defined as auto()
@@ -243,8 +355,477 @@ class EnumDictPatch(
         return list(self.members.values())
 
 
+def _create_member(enum_class, member_name, value, __new__, use_args, member_type):
+    if not isinstance(value, tuple):
+        args = (value,)
+    else:
+        args = value
+    if member_type is tuple:  # special case for tuple enums
+        args = (args,)  # wrap it one more time
+    if not use_args:
+        enum_member = __new__(enum_class)
+    else:
+        enum_member = __new__(enum_class, *args)
+    if hasattr(enum_member, 'value'):
+        member_value = MISSING
+    elif not use_args or member_type is object:
+        member_value = value
+    else:
+        member_value = member_type(*args)
+
+    if enum_class.__setattr__ is EnumPatch.__setattr__:
+        # same as setting attributes one by one, in the same order, but without calling the hook
+        member_dict = enum_member.__dict__
+        if member_value is not MISSING:
+            member_dict['value'] = member_dict['_value_'] = member_value
+        member_dict['name'] = member_dict['_name_'] = member_name
+        member_dict['__objclass__'] = enum_class
+    else:
+        if member_value is not MISSING:
+            enum_member._value_ = member_value
+        enum_member._name_ = member_name
+        # setting protected attributes
+        enum_member.__objclass__ = enum_class
+    enum_member.__init__(*args)
+    return enum_member
+
+
+def _set_member_attr(enum_class, member_name, enum_member, dynamic_attributes):
+    dynamic_attr: DynamicClassAttributePatch = dynamic_attributes.get(member_name)
+    if dynamic_attr is not None:
+        # Setting attrs respectively to dynamic attribute so access member_name
+        # through a class will be routed to enum_member
+        # name and value dynamic attrs are deleted from EnumMeta and shouldn't fall in this condition at this point
+        # this is just a way to support any user defined dynamic class attrs
+        dynamic_attr.set_class_attr(enum_class, enum_member)
+    else:
+        # bypassing EnumMeta.__setattr__, since lazy members are already in _member_map_
+        type.__setattr__(enum_class, member_name, enum_member)
+
+
+def _find_unhashable(enum_class, value):
+    """Returns member with given unhashable value or None, in O(1) if class has index of frozen values"""
+    members = enum_class._unique_member_map_.values()
+    frozen_index = enum_class.__dict__.get('_frozen_index_')
+    if frozen_index is not None:
+        return frozen_index.find(value, members)
+    for member in members:
+        if member._value_ == value:
+            return member
+    return None
+
+
+def _add_member(enum_class, member_name, enum_member, dynamic_attributes):
+    value = enum_member.value
+    # If another member with the same value was already defined, the
+    # new member becomes an alias to the existing one.
+    # Hashable values are looked up in reverse mapping, which keeps class
+    # construction linear; only unhashable ones fall back to O(n) scan
+    try:
+        canonical_member = enum_class._value2member_map_.get(value)
+    except TypeError:
+        canonical_member = _find_unhashable(enum_class, value)
+
+    if canonical_member is not None:
+        enum_member = canonical_member
+    else:
+        # Aliases don't appear in member names (only in __members__).
+        enum_class._unique_member_map_[member_name] = enum_member
+        enum_class._member_names_.append(member_name)
+        frozen_index = enum_class.__dict__.get('_frozen_index_')
+        if frozen_index is not None:
+            frozen_index.add(enum_member)
+
+    _set_member_attr(enum_class, member_name, enum_member, dynamic_attributes)
+
+    # now add to _member_map_
+    enum_class._member_map_[member_name] = enum_member
+    try:
+        # This may fail if value is not hashable. We can't add the value
+        # to the map, and by-value lookups for this value will be
+        # linear.
+        enum_class._value2member_map_[value] = enum_member
+    except TypeError:
+        pass
+
+
+class _LazyMember:
+    """Stands in enum class dict for a member that is not created yet"""
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, ownerclass):
+        return ownerclass._member_map_[self.name]
+
+    def __repr__(self):
+        return f'<lazy member {self.name!r}>'
+
+
+class _LazyMap(dict):
+    """
+    Enum map that creates pending members on first lookup by key,
+    and all the rest of them once accessed as a whole
+    """
+    __slots__ = ('_members', '_resolve')
+
+    def __init__(self, members, resolve):
+        dict.__init__(self)
+        self._members = members
+        # returns name of canonical member by key, if member is not created yet
+        self._resolve = resolve
+
+    def __missing__(self, key):
+        # another thread may be creating the same member right now
+        with self._members.lock:
+            if not dict.__contains__(self, key):
+                name = self._resolve(key)
+                if name is None:
+                    raise KeyError(key)
+                self._members.create(name)
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key):
+        if dict.__contains__(self, key):
+            return True
+        with self._members.lock:
+            return dict.__contains__(self, key) or self._resolve(key) is not None
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return dict.setdefault(self, key, default)
+
+    def _create_all(self):
+        # names are cleared once all members are created and maps are final
+        if self._members.names:
+            self._members.create_all()
+
+    def __iter__(self):
+        self._create_all()
+        return dict.__iter__(self)
+
+    def __reversed__(self):
+        self._create_all()
+        return reversed(dict.keys(self))
+
+    def __len__(self):
+        self._create_all()
+        return dict.__len__(self)
+
+    def __eq__(self, other):
+        self._create_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        self._create_all()
+        return dict.__ne__(self, other)
+
+    def __repr__(self):
+        self._create_all()
+        return dict.__repr__(self)
+
+    def keys(self):
+        self._create_all()
+        return dict.keys(self)
+
+    def values(self):
+        self._create_all()
+        return dict.values(self)
+
+    def items(self):
+        self._create_all()
+        return dict.items(self)
+
+    def copy(self):
+        self._create_all()
+        return dict(self)
+
+
+class _LazyMembers:
+    """
+    Definitions of lazy enum members.
+
+    Only names and values are stored on class creation, each member is created
+    on first access by attribute, name or value, and all of them on iteration.
+    """
+
+    def __init__(self, enum_class, member_type, use_args, names, definitions, value2name, aliases, canonical_names):
+        self.enum_class = enum_class
+        self.member_type = member_type
+        self.use_args = use_args
+        # all member names in definition order, including aliases
+        self.names = names
+        # canonical name -> value as it was defined, only for members that are not created yet
+        self.definitions = definitions
+        # value of the member -> canonical name
+        self.value2name = value2name
+        # canonical name -> its aliases
+        self.aliases = aliases
+        # alias -> canonical name
+        self.canonical_names = canonical_names
+
+        # canonical name -> its index among canonical members
+        self.ordinals = {name: ordinal for ordinal, name in enumerate(definitions)}
+
+        self.__new__ = None
+        self.dynamic_attributes = {}
+        self.member_map = self.unique_member_map = self.value2member_map = None
+        # members are created under the lock, so other threads never see them half-created;
+        # reentrant, since custom __new__ may access other members
+        self.lock = threading.RLock()
+
+    @classmethod
+    def from_definitions(cls, enum_class, enum_members, member_type, use_args):
+        """Returns None when members can't be created lazily"""
+        definitions, value2name, aliases, canonical_names = {}, {}, {}, {}
+        for member_name, value in enum_members.items():
+            # computing value the same way as _create_member does
+            if not use_args or member_type is object:
+                member_value = value
+            else:
+                args = value if isinstance(value, tuple) else (value,)
+                if member_type is tuple:
+                    args = (args,)
+                member_value = member_type(*args)
+            try:
+                canonical_name = value2name.setdefault(member_value, member_name)
+            except TypeError:
+                # lookups by unhashable values are linear anyway
+                return None
+            if canonical_name == member_name:
+                definitions[member_name] = value
+            else:
+                aliases.setdefault(canonical_name, []).append(member_name)
+                canonical_names[member_name] = canonical_name
+        return cls(
+            enum_class, member_type, use_args, list(enum_members), definitions, value2name, aliases, canonical_names
+        )
+
+    def install(self, __new__, dynamic_attributes):
+        self.__new__ = __new__
+        self.dynamic_attributes = dynamic_attributes
+
+        enum_class = self.enum_class
+        for member_name in self.names:
+            _set_member_attr(enum_class, member_name, _LazyMember(member_name), dynamic_attributes)
+
+        enum_class._member_names_.extend(self.definitions)
+        self.member_map = enum_class._member_map_ = _LazyMap(self, self._resolve_name)
+        self.unique_member_map = enum_class._unique_member_map_ = _LazyMap(self, self._resolve_canonical_name)
+        self.value2member_map = enum_class._value2member_map_ = _LazyMap(self, self.value2name.get)
+
+    def _resolve_name(self, name):
+        if name in self.definitions:
+            return name
+        return self.canonical_names.get(name)
+
+    def _resolve_canonical_name(self, name):
+        if name in self.definitions:
+            return name
+        return None
+
+    def create(self, name):
+        with self.lock:
+            self._create(name)
+
+    def _create(self, name):
+        value = self.definitions.pop(name, MISSING)
+        if value is MISSING:
+            # already created
+            return
+        enum_class = self.enum_class
+        enum_member = _create_member(enum_class, name, value, self.__new__, self.use_args, self.member_type)
+        enum_class.__dict__['_ordinals_'][id(enum_member)] = self.ordinals[name]
+
+        _set_member_attr(enum_class, name, enum_member, self.dynamic_attributes)
+        dict.__setitem__(self.member_map, name, enum_member)
+        dict.__setitem__(self.unique_member_map, name, enum_member)
+        dict.__setitem__(self.value2member_map, enum_member._value_, enum_member)
+        for alias in self.aliases.get(name, ()):
+            _set_member_attr(enum_class, alias, enum_member, self.dynamic_attributes)
+            dict.__setitem__(self.member_map, alias, enum_member)
+
+        if not self.definitions:
+            self._finish()
+
+    def create_all(self):
+        with self.lock:
+            for name in tuple(self.definitions):
+                self._create(name)
+
+    def _finish(self):
+        """Restores definition order of members and replaces lazy maps with regular ones"""
+        enum_class = self.enum_class
+        member_map = {name: dict.__getitem__(self.member_map, name) for name in self.names}
+        unique_member_map = {name: member_map[name] for name in enum_class._member_names_}
+        value2member_map = {member._value_: member for member in unique_member_map.values()}
+        # keeping pseudo-members that could be added in the meantime
+        for value, member in dict.items(self.value2member_map):
+            value2member_map.setdefault(value, member)
+
+        for lazy_map, regular_map in (
+                (self.member_map, member_map),
+                (self.unique_member_map, unique_member_map),
+                (self.value2member_map, value2member_map),
+        ):
+            dict.clear(lazy_map)
+            dict.update(lazy_map, regular_map)
+
+        enum_class._member_map_ = member_map
+        enum_class._unique_member_map_ = unique_member_map
+        enum_class._value2member_map_ = value2member_map
+        _set_member_sequences(enum_class)
+        self.names = []
+        self.value2name.clear()
+        self.aliases.clear()
+        self.canonical_names.clear()
+        self.ordinals.clear()
+
+
+def _set_member_sequences(enum_class):
+    """
+    Numbers canonical members in definition order and caches tuples of them and their values,
+    unless some lazy members are not created yet, then it's done once all of them are created.
+    """
+    unique_member_map = enum_class.__dict__.get('_unique_member_map_', {})
+    if isinstance(unique_member_map, _LazyMap) and unique_member_map._members.definitions:
+        members = values = None
+        # lazy members add their ordinals once they're created
+        ordinals = enum_class.__dict__.get('_ordinals_', {})
+    else:
+        members = tuple(unique_member_map.values())
+        values = tuple([member._value_ for member in members])
+        # ordinals are kept by ids of members in class, one more key in instance dicts
+        # would stop CPython from sharing keys between them, and members may be unhashable
+        ordinals = {id(member): ordinal for ordinal, member in enumerate(members)}
+    type.__setattr__(enum_class, '_members_', members)
+    type.__setattr__(enum_class, '_values_', values)
+    type.__setattr__(enum_class, '_ordinals_', ordinals)
+
+
+def _get_ordinal(enum_class, member):
+    """Returns index of canonical member of enum_class in definition order, or None for other objects"""
+    ordinals = enum_class.__dict__.get('_ordinals_')
+    return None if ordinals is None else ordinals.get(id(member))
+
+
+def _get_members(enum_class):
+    members = enum_class._members_
+    if members is None:
+        unique_member_map = enum_class._unique_member_map_
+        if isinstance(unique_member_map, _LazyMap):
+            # tuples are cached once all pending lazy members are created
+            unique_member_map._create_all()
+            members = enum_class._members_
+        if members is None:
+            # class is being created, members may iterate over ones created before them
+            members = tuple(unique_member_map.values())
+    return members
+
+
+_enum_repr = Enum.__repr__
+_enum_str = Enum.__str__
+_enum_format = Enum.__format__
+_flag_repr = Flag.__repr__
+_flag_str = Flag.__str__
+
+
+def _reset_string_caches(enum_class):
+    # not inherited, since each class renders its own members;
+    # classes with unhashable values don't have caches, so that their members don't raise TypeError on each call
+    caches_used = _has_hashable_values(enum_class)
+    type.__setattr__(enum_class, '_repr_cache_', {} if caches_used else None)
+    type.__setattr__(enum_class, '_str_cache_', {} if caches_used else None)
+    type.__setattr__(enum_class, '_format_cache_', {} if caches_used else None)
+
+
+def _has_hashable_values(enum_class):
+    """Tells whether all values of canonical members, including lazy ones that are not created yet, are hashable"""
+    values = enum_class.__dict__.get('_values_')
+    if values is None:
+        unique_member_map = enum_class.__dict__.get('_unique_member_map_', {})
+        values = [member._value_ for member in dict.values(unique_member_map)]
+        if isinstance(unique_member_map, _LazyMap):
+            values.extend(unique_member_map._members.definitions.values())
+    for value in values:
+        try:
+            hash(value)
+        except TypeError:
+            return False
+    return True
+
+
+def _clear_string_caches(enum_class):
+    for name in ('_repr_cache_', '_str_cache_', '_format_cache_'):
+        cache = enum_class.__dict__.get(name)
+        if cache:
+            cache.clear()
+
+
+def _remember_string(member, cache, text):
+    # with limited number of pseudo-members, their renderings are not kept either
+    if member._name_ is not None or getattr(member.__class__, '_pseudo_members_', None) is None:
+        try:
+            cache[member._value_] = text
+        except TypeError:
+            # unhashable value
+            pass
+    return text
+
+
+# hook that just raises, lookup misses don't need to call it
+_default_missing = Enum._missing_.__func__
+
+
+def _find_member(enum_class, value):
+    """Returns member the same way as enum_class(value) does, or MISSING instead of raising ValueError"""
+    if value.__class__ is enum_class:
+        return value
+    try:
+        member = enum_class._value2member_map_.get(value, MISSING)
+    except TypeError:
+        _get_counters(enum_class).linear_scans += 1
+        member = _find_unhashable(enum_class, value)
+        if member is not None:
+            return member
+        member = MISSING
+    # _missing_ may be overridden with staticmethod or plain function
+    if member is not MISSING or getattr(enum_class._missing_, '__func__', None) is _default_missing:
+        return member
+    # _missing_ may create a member, e.g. pseudo-member of Flag
+    try:
+        missing_cache = getattr(enum_class, '_missing_cache_', None)
+        if missing_cache is not None:
+            # cached misses shouldn't cost raising ValueError
+            result = _call_missing_cached(enum_class, missing_cache, value)
+            if result is None:
+                _get_counters(enum_class).missing_misses += 1
+                return MISSING
+            if isinstance(result, enum_class):
+                return result
+        return enum_class(value)
+    except ValueError:
+        return MISSING
+
+
 class EnumMetaPatch(
-    type, Patch, target=EnumMeta, delete={'__getattr__'}, update={'__new__', '__iter__'}
+    type,
+    Patch,
+    target=EnumMeta,
+    delete={'__getattr__'},
+    update={
+        '__new__', '__call__', '__setattr__', '__iter__', '__reversed__', 'by_index', 'get', 'has_value', 'lookup',
+        'from_values', 'to_values', 'valid_mask',
+    },
 ):
 
     def __new__(metacls, cls, bases, classdict):
@@ -253,6 +834,7 @@ class EnumMetaPatch(
         # inherited __new__ unless a new __new__ is defined (or the resulting
         # class will fail).
         #
+        start = perf_counter()
         # remove any keys listed in _ignore_
         classdict.setdefault('_ignore_', []).append('_ignore_')
         ignore = classdict['_ignore_']
@@ -283,6 +865,12 @@ class EnumMetaPatch(
 
         # create our new Enum type
         enum_class = type.__new__(metacls, cls, bases, classdict)
+        # before any lookups, that would count hits on counters of base enum otherwise
+        counters = _get_counters(enum_class)
+        _reset_string_caches(enum_class)
+        # not inheriting members of base enum, tuples are cached once members are created
+        type.__setattr__(enum_class, '_members_', None)
+        type.__setattr__(enum_class, '_values_', None)
         enum_class._member_names_ = []  # names in definition order
         enum_class._member_map_ = {}  # name->value map
         enum_class._unique_member_map_ = {}
@@ -341,61 +929,28 @@ class EnumMetaPatch(
         # we instantiate first instead of checking for duplicates first in case
         # a custom __new__ is doing something funky with the values -- such as
         # auto-numbering ;)
-        for member_name, value in enum_members.items():
-            if not isinstance(value, tuple):
-                args = (value,)
-            else:
-                args = value
-            if member_type is tuple:  # special case for tuple enums
-                args = (args,)  # wrap it one more time
-            if not use_args:
-                enum_member = __new__(enum_class)
-                if not hasattr(enum_member, 'value'):
-                    enum_member._value_ = value
-            else:
-                enum_member = __new__(enum_class, *args)
-                if not hasattr(enum_member, 'value'):
-                    if member_type is object:
-                        enum_member._value_ = value
-                    else:
-                        enum_member._value_ = member_type(*args)
-
-            value = enum_member.value
-            enum_member._name_ = member_name
-            # setting protected attributes
-            enum_member.__objclass__ = enum_class
-            enum_member.__init__(*args)
-            # If another member with the same value was already defined, the
-            # new member becomes an alias to the existing one.
-            for name, canonical_member in enum_class._member_map_.items():
-                if canonical_member.value == enum_member.value:
-                    enum_member = canonical_member
-                    break
-            else:
-                # Aliases don't appear in member names (only in __members__).
-                enum_class._unique_member_map_[member_name] = enum_member
-                enum_class._member_names_.append(member_name)
-
-            dynamic_attr: DynamicClassAttributePatch = dynamic_attributes.get(member_name)
-            if dynamic_attr is not None:
-                # Setting attrs respectively to dynamic attribute so access member_name
-                # through a class will be routed to enum_member
-                # setattr(enum_class, dynamic_attr.class_attr_name, enum_member)
-                # name and value dynamic attrs are deleted from EnumMeta and shouldn't fall in this condition at this point
-                # this is just a way to support any user defined dynamic class attrs
-                dynamic_attr.set_class_attr(enum_class, enum_member)
-            else:
-                setattr(enum_class, member_name, enum_member)
+        value_freezer = getattr(enum_class, '_value_freezer_', None)
+        if value_freezer is not None:
+            # index is filled as members are added, so aliases are found in O(1) too
+            set_value_freezer(enum_class, value_freezer)
 
-            # now add to _member_map_
-            enum_class._member_map_[member_name] = enum_member
-            try:
-                # This may fail if value is not hashable. We can't add the value
-                # to the map, and by-value lookups for this value will be
-                # linear.
-                enum_class._value2member_map_[value] = enum_member
-            except TypeError:
-                pass
+        lazy_members = None
+        if (getattr(enum_class, '_lazy_', False) and __new__ in {object.__new__, member_type.__new__}
+                and value_freezer is None):
+            # members with custom __new__ can't be created lazily,
+            # since their values are unknown until they are created;
+            # index of frozen values needs all members as well
+            lazy_members = _LazyMembers.from_definitions(enum_class, enum_members, member_type, use_args)
+
+        if lazy_members is not None:
+            lazy_members.install(__new__, dynamic_attributes)
+        else:
+            for member_name, value in enum_members.items():
+                enum_member = _create_member(enum_class, member_name, value, __new__, use_args, member_type)
+                _add_member(enum_class, member_name, enum_member, dynamic_attributes)
+        _set_member_sequences(enum_class)
+        # values are known now
+        _reset_string_caches(enum_class)
 
         # double check that repr and friends are not the mixin's or various
         # things break (such as pickle)
@@ -408,6 +963,13 @@ class EnumMetaPatch(
             if obj_method is not None and obj_method is class_method:
                 setattr(enum_class, name, enum_method)
 
+        # members are singletons, so unless class compares them differently, identity hash
+        # is equivalent to Enum.__hash__, but doesn't call python function on each dict lookup;
+        # Flag pseudo-members may be compared by value, see set_pseudo_member_cache_size()
+        if (enum_class.__hash__ is Enum.__hash__ and enum_class.__eq__ is object.__eq__
+                and not issubclass(enum_class, Flag)):
+            enum_class.__hash__ = object.__hash__
+
         # replace any other __new__ with our own (as long as Enum is not None,
         # anyway) -- again, this is to support pickle
         if Enum is not None:
@@ -421,45 +983,782 @@ class EnumMetaPatch(
         if _order_ is not None:
             if isinstance(_order_, str):
                 _order_ = _order_.replace(',', ' ').split()
-            if _order_ != list(enum_class._unique_member_map_):
+            if _order_ != enum_class._member_names_:
                 raise TypeError('member order does not match _order_')
 
+        pseudo_member_cache_size = getattr(enum_class, '_pseudo_member_cache_size_', None)
+        if pseudo_member_cache_size is not None and issubclass(enum_class, Flag):
+            set_pseudo_member_cache_size(enum_class, pseudo_member_cache_size)
+
+        if getattr(enum_class, '_indexes_', None) and lazy_members is None:
+            # indexes of lazy enums are built on first lookup, since it needs all members
+            for index in enum_class._indexes_:
+                _get_index_map(enum_class, index)
+
+        missing_cache_size = getattr(enum_class, '_missing_cache_size_', None)
+        if missing_cache_size is not None:
+            set_missing_cache_size(enum_class, missing_cache_size)
+
+        # inherited from base enum, like other options
+        pickle_by = getattr(enum_class, '_pickle_by_', None)
+        if pickle_by is not None and '__reduce_ex__' not in classdict:
+            set_pickle_by(enum_class, pickle_by)
+
+        counters.constructions += 1
+        counters.construction_time += perf_counter() - start
         return enum_class
 
+    def __call__(cls, value, names=None, *, module=None, qualname=None, type=None, start=1):
+        """
+        Either returns an existing member, or creates a new enum class.
+
+        This method is used both when an enum class is given a value to match
+        to an enumeration member (i.e. Color(3)) and for the functional API
+        (i.e. Color = Enum('Color', names='RED GREEN BLUE')).
+
+        When used for the functional API:
+
+        `value` will be the name of the new class.
+
+        `names` should be either a string of white-space/comma delimited names
+        (values will start at `start`), or an iterator/mapping of name, value pairs.
+
+        `module` should be set to the module this class is being created in;
+        if it is not set, an attempt to find that module will be made, but if
+        it fails the class will not be picklable.
+
+        `qualname` should be set to the actual location this class can be found
+        at in its module; by default it is set to the global scope.  If this is
+        not correct, unpickling will fail in some circumstances.
+
+        `type`, if set, will be mixed in as the first base class.
+        """
+        if names is None:  # simple value lookup
+            # same as the first steps of Enum.__new__, but without calling it,
+            # which makes successful lookups about twice as fast
+            if value.__class__ is not cls:
+                try:
+                    member = cls._value2member_map_[value]
+                except (KeyError, TypeError):
+                    pass
+                else:
+                    # off by default, global flag is the cheapest check for the hottest path
+                    if _count_hits:
+                        cls._counters_.fast_hits += 1
+                    return member
+            return cls.__new__(cls, value)
+        # otherwise, functional API: we're creating a new Enum type
+        return cls._create_(
+                value,
+                names,
+                module=module,
+                qualname=qualname,
+                type=type,
+                start=start,
+                )
+
+    def get(cls, value, default=None):
+        """
+        Returns member by value (same as cls(value)), or default if there's no such member.
+
+        Misses don't raise and catch ValueError, unless class defines its own _missing_ hook.
+        """
+        try:
+            # fast path for hits, without calling anything
+            member = cls._value2member_map_.get(value, MISSING)
+        except TypeError:
+            member = MISSING
+        if member is MISSING:
+            member = _find_member(cls, value)
+            return default if member is MISSING else member
+        if _count_hits:
+            cls._counters_.fast_hits += 1
+        return member
+
+    def has_value(cls, value):
+        """Tells whether cls(value) would return a member, without raising ValueError"""
+        try:
+            if value in cls._value2member_map_:
+                if _count_hits:
+                    cls._counters_.fast_hits += 1
+                return True
+        except TypeError:
+            pass
+        return _find_member(cls, value) is not MISSING
+
+    def lookup(cls, index, key, *default):
+        """
+        Returns member by key of index declared in _indexes_ or with fastenum.add_index(),
+        raises KeyError if there's no such member, unless default is given.
+        """
+        index_maps = cls.__dict__.get('_index_maps_')
+        try:
+            index_map = index_maps[index]
+        except (KeyError, TypeError):
+            index_map = _get_index_map(cls, index)
+        try:
+            return index_map[key]
+        except KeyError:
+            if default:
+                return default[0]
+            raise KeyError(key) from None
+
+    def __setattr__(cls, name, value):
+        """Block attempts to reassign Enum members.
+
+        A simple assignment to the class namespace only changes one of the
+        several possible ways to get an Enum member from an Enum class,
+        resulting in an inconsistent Enumeration.
+        """
+        member_map = cls.__dict__.get('_member_map_', {})
+        if name in member_map:
+            raise AttributeError('Cannot reassign members.')
+        if name == '__name__':
+            # class name is part of members renderings
+            _clear_string_caches(cls)
+        type.__setattr__(cls, name, value)
+
     def __iter__(cls):
-        return iter(cls._unique_member_map_.values())
+        members = cls._members_
+        if members is None:
+            members = _get_members(cls)
+        return iter(members)
 
     def __reversed__(cls):
-        return reversed(list(cls._unique_member_map_.values()))
+        return reversed(_get_members(cls))
+
+    def by_index(cls, index):
+        """
+        Returns member by its index in definition order (its _ordinal_), aliases are not counted.
+        Negative indexes count from the end, IndexError is raised for indexes out of range.
+        """
+        return _get_members(cls)[index]
+
+    def from_values(cls, values):
+        """Converts array of values to numpy array of members, see fastenum.bulk"""
+        from fastenum import bulk
+        return bulk.from_values(cls, values)
+
+    def to_values(cls, members):
+        """Converts sequence of members to numpy array of their values"""
+        from fastenum import bulk
+        return bulk.to_values(cls, members)
+
+    def valid_mask(cls, values):
+        """Returns boolean numpy array telling which values belong to named members"""
+        from fastenum import bulk
+        return bulk.valid_mask(cls, values)
+
+
+class FlagPatch(
+    Patch,
+    target=Flag,
+    update={
+        '_create_pseudo_member_', '_pseudo_members_', '_decompositions_',
+        '__or__', '__and__', '__xor__', '__invert__', '__repr__', '__str__',
+    },
+):
+    # bounded caches of pseudo-members and _decompose results, see set_pseudo_member_cache_size()
+    _pseudo_members_ = None
+    _decompositions_ = None
+
+    @classmethod
+    def _create_pseudo_member_(cls, value):
+        """
+        Create a composite member iff value contains only members.
+        """
+        pseudo_member = cls._value2member_map_.get(value, None)
+        if pseudo_member is None:
+            if cls._pseudo_members_ is not None:
+                pseudo_member = cls._pseudo_members_.get(value)
+                if pseudo_member is not None:
+                    return pseudo_member
+            # verify all bits are accounted for
+            _, extra_flags = _decompose(cls, value)
+            if extra_flags:
+                raise ValueError("%r is not a valid %s" % (value, _error_class_name(cls)))
+            # construct a singleton enum pseudo-member
+            pseudo_member = object.__new__(cls)
+            _init_pseudo_member(cls, value, pseudo_member)
+            pseudo_member = _add_pseudo_member(cls, value, pseudo_member)
+        return pseudo_member
+
+    def __repr__(self):
+        cache = self._repr_cache_
+        if cache is None:
+            return _flag_repr(self)
+        try:
+            return cache[self._value_]
+        except (KeyError, TypeError):
+            return _remember_string(self, cache, _flag_repr(self))
+
+    def __str__(self):
+        cache = self._str_cache_
+        if cache is None:
+            return _flag_str(self)
+        try:
+            return cache[self._value_]
+        except (KeyError, TypeError):
+            return _remember_string(self, cache, _flag_str(self))
+
+    # operators look up resulting member right away, cls(value) is only called
+    # when it needs to be created or is kept in bounded pseudo-member cache
+
+    def __or__(self, other):
+        cls = self.__class__
+        if other.__class__ is not cls and not isinstance(other, cls):
+            return NotImplemented
+        value = self._value_ | other._value_
+        try:
+            return cls._value2member_map_[value]
+        except KeyError:
+            return cls(value)
+
+    def __and__(self, other):
+        cls = self.__class__
+        if other.__class__ is not cls and not isinstance(other, cls):
+            return NotImplemented
+        value = self._value_ & other._value_
+        try:
+            return cls._value2member_map_[value]
+        except KeyError:
+            return cls(value)
+
+    def __xor__(self, other):
+        cls = self.__class__
+        if other.__class__ is not cls and not isinstance(other, cls):
+            return NotImplemented
+        value = self._value_ ^ other._value_
+        try:
+            return cls._value2member_map_[value]
+        except KeyError:
+            return cls(value)
+
+    def __invert__(self):
+        cls = self.__class__
+        value = self._value_
+        # combining values of all members that don't share bits with self,
+        # without decomposing self and creating intermediate pseudo-members
+        inverted = 0
+        for member in cls:
+            if not member._value_ & value:
+                inverted |= member._value_
+        try:
+            return cls._value2member_map_[inverted]
+        except KeyError:
+            return cls(inverted)
+
+
+class IntFlagPatch(
+    Patch,
+    target=IntFlag,
+    update={'_create_pseudo_member_', '__or__', '__and__', '__xor__', '__ror__', '__rand__', '__rxor__', '__invert__'},
+):
+
+    @classmethod
+    def _create_pseudo_member_(cls, value):
+        """
+        Create a composite member iff value contains only members.
+        """
+        pseudo_member = cls._value2member_map_.get(value, None)
+        if pseudo_member is None:
+            if cls._pseudo_members_ is not None:
+                pseudo_member = cls._pseudo_members_.get(value)
+                if pseudo_member is not None:
+                    return pseudo_member
+            need_to_create = [value]
+            # get unaccounted for bits
+            _, extra_flags = _decompose(cls, value)
+            while extra_flags:
+                bit = _high_bit(extra_flags)
+                flag_value = 2 ** bit
+                if (flag_value not in cls._value2member_map_ and
+                        flag_value not in need_to_create
+                        ):
+                    need_to_create.append(flag_value)
+                if extra_flags == -flag_value:
+                    extra_flags = 0
+                else:
+                    extra_flags ^= flag_value
+            for value in reversed(need_to_create):
+                # construct singleton pseudo-members
+                pseudo_member = int.__new__(cls, value)
+                _init_pseudo_member(cls, value, pseudo_member)
+                pseudo_member = _add_pseudo_member(cls, value, pseudo_member)
+        return pseudo_member
+
+    def __or__(self, other):
+        cls = self.__class__
+        if other.__class__ is cls:
+            value = self._value_ | other._value_
+        elif isinstance(other, (cls, int)):
+            value = self._value_ | cls(other)._value_
+        else:
+            return NotImplemented
+        try:
+            return cls._value2member_map_[value]
+        except KeyError:
+            return cls(value)
+
+    def __and__(self, other):
+        cls = self.__class__
+        if other.__class__ is cls:
+            value = self._value_ & other._value_
+        elif isinstance(other, (cls, int)):
+            value = self._value_ & cls(other)._value_
+        else:
+            return NotImplemented
+        try:
+            return cls._value2member_map_[value]
+        except KeyError:
+            return cls(value)
+
+    def __xor__(self, other):
+        cls = self.__class__
+        if other.__class__ is cls:
+            value = self._value_ ^ other._value_
+        elif isinstance(other, (cls, int)):
+            value = self._value_ ^ cls(other)._value_
+        else:
+            return NotImplemented
+        try:
+            return cls._value2member_map_[value]
+        except KeyError:
+            return cls(value)
+
+    __ror__ = __or__
+    __rand__ = __and__
+    __rxor__ = __xor__
+
+    def __invert__(self):
+        cls = self.__class__
+        value = ~self._value_
+        try:
+            return cls._value2member_map_[value]
+        except KeyError:
+            return cls(value)
+
+
+def _init_pseudo_member(flag_cls, value, pseudo_member):
+    if getattr(flag_cls, '_compact_', False):
+        # same attributes in the same order as named members get in _create_member(),
+        # otherwise CPython stops sharing keys between instance dicts of the class
+        pseudo_member._value_ = value
+        pseudo_member._name_ = None
+        pseudo_member.__objclass__ = flag_cls
+    else:
+        pseudo_member._name_ = None
+        pseudo_member._value_ = value
 
 
-# faster _decompose version from python 3.9
+def _add_pseudo_member(flag_cls, value, pseudo_member):
+    _get_counters(flag_cls).pseudo_members += 1
+    single_bit = value > 0 and not value & (value - 1)
+    if single_bit:
+        # decompositions of other values may include new single bit
+        bit_table = flag_cls.__dict__.get('_bit_table_')
+        if bit_table is not None:
+            bit_table.decompositions.clear()
+        if flag_cls._decompositions_ is not None:
+            flag_cls._decompositions_.clear()
+    pseudo_members = flag_cls._pseudo_members_
+    if pseudo_members is None or single_bit:
+        # use setdefault in case another thread already created a composite
+        # with this value; single bits are never evicted, since decomposition
+        # of other values relies on them
+        return flag_cls._value2member_map_.setdefault(value, pseudo_member)
+    return pseudo_members.setdefault(value, pseudo_member)
+
+
+def _value_eq(self, other):
+    if other.__class__ is self.__class__:
+        return self._value_ == other._value_
+    return NotImplemented
+
+
+def set_pseudo_member_cache_size(flag_cls, maxsize):
+    """
+    Limits number of pseudo-members (combinations of flags that are not defined in the class)
+    and cached decompositions that flag class keeps, evicting least recently used ones.
+
+    Passing None as maxsize removes the limit, which is default behaviour.
+    Named members and single bits are never evicted.
+
+    Since pseudo-members may be recreated after eviction, Flag pseudo-members
+    are compared by value instead of identity once limit is set.
+    """
+    if not issubclass(flag_cls, Flag):
+        raise TypeError(f'{flag_cls!r} is not a Flag')
+
+    pseudo_members = flag_cls.__dict__.get('_pseudo_members_')
+    value2member_map = flag_cls._value2member_map_
+    if maxsize is None:
+        if pseudo_members is not None:
+            for value, pseudo_member in pseudo_members.items():
+                value2member_map.setdefault(value, pseudo_member)
+            type.__setattr__(flag_cls, '_pseudo_members_', None)
+            type.__setattr__(flag_cls, '_decompositions_', None)
+        return
+
+    if pseudo_members is not None:
+        pseudo_members.resize(maxsize)
+        flag_cls._decompositions_.resize(maxsize)
+        return
+
+    pseudo_members = LRUCache(maxsize)
+    named_values = {member._value_ for member in flag_cls._member_map_.values()}
+    for value, member in tuple(value2member_map.items()):
+        if value not in named_values and (value <= 0 or value & (value - 1)):
+            pseudo_members[value] = value2member_map.pop(value)
+
+    if not issubclass(flag_cls, int) and flag_cls.__eq__ is object.__eq__:
+        type.__setattr__(flag_cls, '__eq__', _value_eq)
+    type.__setattr__(flag_cls, '_decompositions_', LRUCache(maxsize))
+    type.__setattr__(flag_cls, '_pseudo_members_', pseudo_members)
+
+
+def pseudo_member_cache_info(flag_cls):
+    """
+    Returns statistics of pseudo-members and decompositions caches of the flag class,
+    or None if its cache size is not limited
+    """
+    pseudo_members = flag_cls.__dict__.get('_pseudo_members_')
+    if pseudo_members is None:
+        return None
+    return {
+        'pseudo_members': pseudo_members.info(),
+        'decompositions': flag_cls._decompositions_.info(),
+    }
+
+
+def _get_index_map(enum_class, index):
+    """Returns mapping of keys to members for given index of the class, building it if needed"""
+    index_maps = enum_class.__dict__.get('_index_maps_')
+    if index_maps is None:
+        # not inherited, since each class has its own members
+        index_maps = {}
+        type.__setattr__(enum_class, '_index_maps_', index_maps)
+    index_map = index_maps.get(index)
+    if index_map is not None:
+        return index_map
+
+    indexes = getattr(enum_class, '_indexes_', None) or {}
+    if index not in indexes:
+        raise ValueError(f'{enum_class.__qualname__} has no index {index!r}')
+    key = indexes[index]
+    get_key = attrgetter(key) if isinstance(key, str) else key
+    index_map = {}
+    for member in enum_class._unique_member_map_.values():
+        # the same as with values, first member wins
+        index_map.setdefault(get_key(member), member)
+    index_maps[index] = index_map
+    return index_map
+
+
+def add_index(enum_class, index, key):
+    """
+    Adds index that allows to find members with enum_class.lookup(index, member_key) in O(1).
+
+    Key is either name of member attribute (e.g. 'phrase' for HTTPStatus), or function of member
+    (e.g. lambda member: member.name.lower()). If many members have the same key, the first one is found.
+    """
+    indexes = dict(getattr(enum_class, '_indexes_', None) or {})
+    indexes[index] = key
+    type.__setattr__(enum_class, '_indexes_', indexes)
+    index_maps = enum_class.__dict__.get('_index_maps_')
+    if index_maps is not None:
+        index_maps.pop(index, None)
+    if enum_class._member_names_:
+        _get_index_map(enum_class, index)
+
+
+def set_value_freezer(enum_class, freezer=True):
+    """
+    Makes lookups by unhashable values (lists, dicts, dataclass instances...) O(1) instead of comparing
+    the value with each member, by finding members by frozen (hashable) versions of their values.
+
+    Freezer is either True for fastenum.freeze(), or function that returns hashable value, which is equal
+    for equal values only, and raises TypeError for values it can't freeze. None disables the index, which is default.
+    """
+    type.__setattr__(enum_class, '_value_freezer_', freezer)
+    if freezer is None:
+        type.__setattr__(enum_class, '_frozen_index_', None)
+        return
+
+    frozen_index = FrozenValueIndex(freeze if freezer is True else freezer)
+    for member in enum_class._unique_member_map_.values():
+        frozen_index.add(member)
+    type.__setattr__(enum_class, '_frozen_index_', frozen_index)
+
+
+_NOT_CACHED = object()
+
+
+def _call_missing_cached(enum_class, cache, value):
+    # cached results may be wrong once members are added or maps are replaced;
+    # dict.__len__ doesn't make lazy maps create all pending members
+    member_map = enum_class._member_map_
+    state = (id(member_map), dict.__len__(member_map), dict.__len__(enum_class._value2member_map_))
+    if enum_class.__dict__.get('_missing_cache_state_') != state:
+        cache.clear()
+        type.__setattr__(enum_class, '_missing_cache_state_', state)
+
+    try:
+        # 1 and True are equal, but _missing_ may treat them differently
+        key = (value.__class__, value)
+        result = cache.get(key, _NOT_CACHED)
+    except TypeError:
+        # unhashable values can't be cached
+        _get_counters(enum_class).missing_calls += 1
+        return enum_class._missing_(value)
+
+    if result is _NOT_CACHED:
+        counters = _get_counters(enum_class)
+        counters.missing_calls += 1
+        result = enum_class._missing_(value)
+        # errors are not cached, so they're raised every time
+        if result is None or isinstance(result, enum_class):
+            cache[key] = result
+    return result
+
+
+def set_missing_cache_size(enum_class, maxsize):
+    """
+    Makes enum class remember results of its _missing_ hook for up to `maxsize` most recently used values,
+    both found members and misses. Passing None as maxsize disables cache, which is default behaviour.
+
+    Results are forgotten when members of the class change. Unhashable values are never cached.
+    """
+    if maxsize is None:
+        type.__setattr__(enum_class, '_missing_cache_', None)
+        return
+
+    cache = enum_class.__dict__.get('_missing_cache_')
+    if cache is not None:
+        cache.resize(maxsize)
+    else:
+        type.__setattr__(enum_class, '_missing_cache_', LRUCache(maxsize))
+
+
+def missing_cache_info(enum_class):
+    """Returns statistics of _missing_ results cache, or None if it's not enabled for the class"""
+    cache = enum_class.__dict__.get('_missing_cache_')
+    return None if cache is None else cache.info()
+
+
+EnumStats = namedtuple('EnumStats', (
+    'fast_hits', 'new_hits', 'linear_scans', 'missing_calls', 'missing_misses',
+    'pseudo_members', 'decompose_calls', 'constructions', 'construction_time',
+))
+
+
+class _Counters:
+    """Counters of lookups and slow paths of one enum class, see stats()"""
+
+    __slots__ = EnumStats._fields
+
+    def __init__(self):
+        for field in self.__slots__:
+            setattr(self, field, 0)
+
+    def info(self):
+        return EnumStats(*[getattr(self, field) for field in self.__slots__])
+
+
+def _get_counters(enum_class):
+    counters = enum_class.__dict__.get('_counters_')
+    if counters is None:
+        counters = _Counters()
+        type.__setattr__(enum_class, '_counters_', counters)
+    return counters
+
+
+# successful lookups are counted only after set_hit_counting(), see stats()
+_count_hits = False
+
+
+def set_hit_counting(enabled=True):
+    """
+    Makes all enum classes count successful lookups in fast_hits and new_hits of stats().
+
+    It's off by default, since counting makes the fastest lookups (e.g. Color(1)) noticeably slower,
+    other counters are always updated.
+    """
+    global _count_hits
+    _count_hits = bool(enabled)
+
+
+def stats(enum_class=None):
+    """
+    Returns counters of lookups and slow paths taken by enum classes, as mapping of classes to EnumStats
+    (only ones with non-zero counters), or EnumStats of one class, if it's given:
+
+    - fast_hits: lookups found by hashable value right in EnumMeta.__call__ (e.g. Color(1)), Color.get() and
+      Color.has_value(), which is the fast path
+    - new_hits: lookups that missed that fast path, but found member by value in Enum.__new__
+      (e.g. Color(Color.RED), or unpickling)
+
+      Both are counted only after set_hit_counting(True).
+    - linear_scans: lookups by unhashable values, that compare value with members, unless class has _value_freezer_
+    - missing_calls, missing_misses: calls of _missing_ hook (excluding results found in its cache),
+      and lookups that it didn't find member for
+    - pseudo_members: pseudo-members created by Flag and IntFlag
+    - decompose_calls: decompositions of flag values, used to create pseudo-members and render them
+    - constructions, construction_time: classes created while fastenum was enabled, and time it took in seconds
+
+    Counters are updated without locking, so some counts may be lost when the same class is used from different threads.
+    """
+    if enum_class is not None:
+        counters = enum_class.__dict__.get('_counters_')
+        return EnumStats(*[0] * len(EnumStats._fields)) if counters is None else counters.info()
+    result = {}
+    for klass in _iter_all_classes():
+        counters = klass.__dict__.get('_counters_')
+        if counters is not None and isinstance(klass, EnumMeta):
+            info = counters.info()
+            if any(info):
+                result[klass] = info
+    return result
+
+
+def reset_stats(enum_class=None):
+    """Sets counters of given enum class, or of all classes, to zero"""
+    classes = _iter_all_classes() if enum_class is None else (enum_class,)
+    for klass in classes:
+        # replaced instead of deleted, since fast paths expect every class to have own counters
+        if '_counters_' in klass.__dict__ and isinstance(klass, EnumMeta):
+            type.__setattr__(klass, '_counters_', _Counters())
+
+
+class _BitTable:
+    """Canonical members of flag class by their bits, and decompositions of values that have members"""
+
+    __slots__ = ('single_bits', 'others', 'decompositions')
+
+    def __init__(self, flag):
+        self.single_bits = {}
+        others = []
+        for member in flag:
+            member_value = member._value_
+            if member_value > 0 and not member_value & (member_value - 1):
+                self.single_bits[member_value] = member
+            elif member_value:
+                others.append((member_value, member))
+        # usually empty, unless flag has members for combinations of bits
+        self.others = tuple(others)
+        self.decompositions = {}
+
+
+def _get_bit_table(flag):
+    # named members don't change after class is created, so table is built once
+    bit_table = flag.__dict__.get('_bit_table_')
+    if bit_table is None:
+        bit_table = _BitTable(flag)
+        type.__setattr__(flag, '_bit_table_', bit_table)
+    return bit_table
+
+
+# faster _decompose version from python 3.9,
+# which only looks at bits set in value instead of all members
 def _decompose(flag, value):
     """Extract all members from the value."""
+    _get_counters(flag).decompose_calls += 1
+    bit_table = _get_bit_table(flag)
+    decompositions = flag._decompositions_
+    if decompositions is None:
+        decompositions = bit_table.decompositions
+    decomposition = decompositions.get(value)
+    if decomposition is not None:
+        members, not_covered = decomposition
+        return list(members), not_covered
+
     # _decompose is only called if the value is not named
     not_covered = value
     negative = value < 0
     members = []
-    for member in flag:
-        member_value = member._value_
-        if member_value and member_value & value == member_value:
+    for member_value, member in bit_table.others:
+        if member_value & value == member_value:
             members.append(member)
             not_covered &= ~member_value
-    if not negative:
-        tmp = not_covered
+    if negative:
+        for member_value, member in bit_table.single_bits.items():
+            if member_value & value:
+                members.append(member)
+                not_covered &= ~member_value
+    else:
+        single_bits = bit_table.single_bits
+        value2member_map = flag._value2member_map_
+        tmp = value
         while tmp:
-            flag_value = 2 ** _high_bit(tmp)
-            if flag_value in flag._value2member_map_:
-                members.append(flag._value2member_map_[flag_value])
+            flag_value = tmp & -tmp
+            tmp ^= flag_value
+            member = single_bits.get(flag_value)
+            # bits that are not covered by named members may have pseudo-members
+            if member is None and flag_value & not_covered:
+                member = value2member_map.get(flag_value)
+            if member is not None:
+                members.append(member)
                 not_covered &= ~flag_value
-            tmp &= ~flag_value
-    if not members and value in flag._value2member_map_:
-        members.append(flag._value2member_map_[value])
+    if not members:
+        if value in flag._value2member_map_:
+            members.append(flag._value2member_map_[value])
+        elif flag._pseudo_members_ is not None:
+            pseudo_member = flag._pseudo_members_.get(value)
+            if pseudo_member is not None:
+                members.append(pseudo_member)
     members.sort(key=lambda m: m._value_, reverse=True)
     if len(members) > 1 and members[0].value == value:
         # we have the breakdown, don't need the value member itself
         members.pop(0)
+
+    if members and (flag._decompositions_ is not None or not not_covered):
+        # value without members is decomposed before its pseudo-member is created;
+        # without limit, only valid values are kept, since they all get pseudo-members
+        decompositions[value] = (tuple(members), not_covered)
     return members, not_covered
 
 
-InstancePatch.new(target=enum, update={'_decompose': _decompose})
+# keeping reference, since patches are only weakly referenced by their base as subclasses
+EnumModulePatch = InstancePatch.new(target=enum, update={'_decompose': _decompose})
+
+
+def _reduce_by_name(self, proto):
+    if self._name_ is None:
+        # pseudo-members of flags don't have names
+        return self.__class__, (self._value_,)
+    # string means that member is pickled as global, just as its class is, e.g. module.Color.RED
+    return f'{self.__class__.__qualname__}.{self._name_}'
+
+
+_REDUCERS = {'name': _reduce_by_name}
+
+
+def set_pickle_by(enum_class, mode):
+    """
+    Changes what is stored in pickles of enum members:
+
+    'value' - default, member is restored by calling enum class with its value;
+    'name' - member is pickled as reference to the class attribute (module.Color.RED), without value.
+
+    Pseudo-members of flags are always pickled by value.
+    """
+    if mode != 'value' and mode not in _REDUCERS:
+        raise ValueError(f"mode must be either 'value' or 'name', got {mode!r}")
+
+    current = enum_class.__dict__.get('__reduce_ex__')
+    if current not in _REDUCERS.values():
+        # keeping whatever was there to restore it later
+        type.__setattr__(enum_class, '_reduce_ex_by_value_', current)
+
+    if mode != 'value':
+        type.__setattr__(enum_class, '__reduce_ex__', _REDUCERS[mode])
+    else:
+        original = enum_class.__dict__['_reduce_ex_by_value_']
+        if original is None:
+            if '__reduce_ex__' in enum_class.__dict__:
+                type.__delattr__(enum_class, '__reduce_ex__')
+            if enum_class.__reduce_ex__ in _REDUCERS.values():
+                # base enum is pickled by name
+                type.__setattr__(enum_class, '__reduce_ex__', Enum.__reduce_ex__)
+        else:
+            type.__setattr__(enum_class, '__reduce_ex__', original)
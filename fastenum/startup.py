@@ -0,0 +1,35 @@
+"""
+Enables fastenum at interpreter startup, before stdlib modules define their enums.
+
+This module is imported by fastenum-autoenable.pth that is installed next to the package,
+but only if FASTENUM_AUTOENABLE environment variable is set, e.g. FASTENUM_AUTOENABLE=1.
+It can also be imported from sitecustomize.py:
+
+    import fastenum.startup
+    fastenum.startup.autoenable()
+
+To be enabled before any stdlib enums are created, importing fastenum must not import modules that define them,
+directly or through other modules: typing and json import re (re.RegexFlag), dataclasses imports inspect,
+numpy imports signal. So fastenum imports typing only for type checkers, and others when they're first needed.
+On Python 3.7 threading imports re through traceback, so re.RegexFlag is created before fastenum is enabled there.
+"""
+import os
+
+import fastenum
+
+ENV_VAR = 'FASTENUM_AUTOENABLE'
+FALSE_VALUES = {'', '0', 'false', 'no', 'off'}
+
+
+def is_requested() -> bool:
+    return os.environ.get(ENV_VAR, '').strip().lower() not in FALSE_VALUES
+
+
+def autoenable(force: bool = False) -> bool:
+    """
+    Enables fastenum if it's requested by environment variable (or if force is True),
+    does nothing if it's already enabled. Returns whether fastenum is enabled.
+    """
+    if (force or is_requested()) and not fastenum.enabled:
+        fastenum.enable()
+    return fastenum.enabled
@@ -0,0 +1,224 @@
+"""
+Sampled latency histograms of enum operations, recorded per enum class while tracing is active.
+"""
+from __future__ import annotations
+import threading
+from enum import EnumMeta, Flag, IntFlag
+from time import perf_counter
+
+TYPE_CHECKING = False  # typing imports re, see fastenum.startup
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# only one tracer may replace methods at a time
+_lock = threading.Lock()
+_active: Optional['Tracer'] = None
+
+
+class Histogram:
+    """Latencies of sampled calls of one operation, in buckets of powers of two nanoseconds"""
+
+    __slots__ = ('count', 'total_ns', 'buckets')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        # calls that took from 2 ** (i - 1) to 2 ** i - 1 nanoseconds are counted in bucket i
+        self.buckets: List[int] = [0] * 64
+
+    def add(self, ns: int) -> None:
+        self.count += 1
+        self.total_ns += ns
+        self.buckets[min(ns.bit_length(), 63)] += 1
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total_ns': self.total_ns,
+            # upper bounds of non-empty buckets
+            'buckets': {str(2 ** i - 1): count for i, count in enumerate(self.buckets) if count},
+        }
+
+
+class Tracer:
+    """
+    Records latency of every `sample_every`th call of traced operations, while it's used as context manager:
+
+    - value_lookup: Color(1), including misses and _missing_ calls
+    - name_lookup: Color['RED']
+    - iteration: list(Color), whole iteration is timed
+    - flag_or, flag_and, flag_xor, flag_invert: operators of Flag and IntFlag members
+
+    Methods are wrapped only while tracer is active, so enums don't pay anything for tracing otherwise.
+    Enabling or disabling fastenum while tracing restores methods it replaces, and they aren't traced anymore.
+    """
+
+    def __init__(self, sample_every: int = 1) -> None:
+        if sample_every < 1:
+            raise ValueError(f'sample_every must be positive, got {sample_every!r}')
+        self.sample_every = sample_every
+        self.histograms: Dict[Tuple[EnumMeta, str], Histogram] = {}
+        # time spent in operations themselves, excluding operations they called, by stacks of operations
+        self.self_times: Dict[Tuple[Tuple[EnumMeta, str], ...], int] = {}
+        self._calls = 0
+        self._local = threading.local()
+        self._replaced: List[Tuple[type, str, Any, Any]] = []
+
+    def __enter__(self) -> 'Tracer':
+        global _active
+        with _lock:
+            if _active is not None:
+                raise RuntimeError('Another tracer is already active')
+            for target, name, operation, wrap in _TRACED:
+                original = target.__dict__[name]
+                wrapper = wrap(self, original, operation)
+                type.__setattr__(target, name, wrapper)
+                self._replaced.append((target, name, original, wrapper))
+            _active = self
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        global _active
+        with _lock:
+            for target, name, original, wrapper in reversed(self._replaced):
+                # method may be replaced by fastenum.enable() or disable() in the meantime
+                if target.__dict__.get(name) is wrapper:
+                    type.__setattr__(target, name, original)
+            self._replaced.clear()
+            _active = None
+
+    def _sampled(self) -> bool:
+        # not locked, sampling from different threads is approximate
+        self._calls += 1
+        return not self._calls % self.sample_every
+
+    def _call(self, enum_class: EnumMeta, operation: str, func: Callable[..., Any], *args: Any) -> Any:
+        try:
+            frames = self._local.frames
+        except AttributeError:
+            frames = self._local.frames = []
+        key = (enum_class, operation)
+        # stack of sampled operations and time spent in sampled operations called by it
+        frame = [frames[-1][0] + (key,) if frames else (key,), 0]
+        frames.append(frame)
+        start = perf_counter()
+        try:
+            return func(*args)
+        finally:
+            ns = int((perf_counter() - start) * 1e9)
+            frames.pop()
+            if frames:
+                frames[-1][1] += ns
+
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms.setdefault(key, Histogram())
+            histogram.add(ns)
+            stack = frame[0]
+            self.self_times[stack] = self.self_times.get(stack, 0) + ns - frame[1]
+
+    def to_json(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Returns histograms as {'module.Class': {'operation': {'count', 'total_ns', 'buckets'}}}"""
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (enum_class, operation), histogram in self.histograms.items():
+            result.setdefault(_class_name(enum_class), {})[operation] = histogram.to_json()
+        return result
+
+    def dump_json(self, path: str) -> None:
+        # json imports re, see fastenum.startup
+        import json
+        with open(path, 'w') as file:
+            json.dump(self.to_json(), file, indent=2)
+
+    def to_collapsed(self) -> str:
+        """
+        Returns sampled time in collapsed stack format, read by flamegraph.pl and compatible tools:
+        'enum;module.Class;operation self_ns' lines, operations called by other ones are nested in them.
+        """
+        lines = [
+            'enum;' + ';'.join(f'{_class_name(enum_class)};{operation}' for enum_class, operation in stack) + f' {ns}'
+            for stack, ns in self.self_times.items()
+        ]
+        return '\n'.join(sorted(lines)) + '\n' if lines else ''
+
+    def dump_collapsed(self, path: str) -> None:
+        with open(path, 'w') as file:
+            file.write(self.to_collapsed())
+
+
+def trace(sample_every: int = 1) -> Tracer:
+    """
+    Returns tracer that records latency of enum operations per enum class, while used as context manager:
+
+    >>> with fastenum.trace(sample_every=100) as tracer:
+    ...     run_workload()
+    >>> tracer.dump_collapsed('enums.folded')  # flamegraph.pl enums.folded > enums.svg
+    """
+    return Tracer(sample_every)
+
+
+def _class_name(enum_class: EnumMeta) -> str:
+    # ';' and spaces separate frames and weights in collapsed stacks
+    return f'{enum_class.__module__}.{enum_class.__qualname__}'.replace(';', ':').replace(' ', '_')
+
+
+def _wrap_call(tracer: Tracer, original: Callable[..., Any], operation: str) -> Callable[..., Any]:
+    def __call__(cls: EnumMeta, value: Any, *args: Any, **kwargs: Any) -> Any:
+        # functional API creates classes, it's not a lookup
+        if args or kwargs or not tracer._sampled():
+            return original(cls, value, *args, **kwargs)
+        return tracer._call(cls, operation, original, cls, value)
+
+    return __call__
+
+
+def _wrap_iter(tracer: Tracer, original: Callable[..., Any], operation: str) -> Callable[..., Any]:
+    def iterate(cls: EnumMeta) -> List[Any]:
+        return list(original(cls))
+
+    def __iter__(cls: EnumMeta) -> Iterator[Any]:
+        if not tracer._sampled():
+            return original(cls)
+        # members are collected at once, since creating iterator is cheap, but iterating may be not
+        return iter(tracer._call(cls, operation, iterate, cls))
+
+    return __iter__
+
+
+def _wrap_class_method(tracer: Tracer, original: Callable[..., Any], operation: str) -> Callable[..., Any]:
+    def wrapper(cls: EnumMeta, *args: Any) -> Any:
+        if not tracer._sampled():
+            return original(cls, *args)
+        return tracer._call(cls, operation, original, cls, *args)
+
+    wrapper.__name__ = original.__name__
+    return wrapper
+
+
+def _wrap_member_method(tracer: Tracer, original: Callable[..., Any], operation: str) -> Callable[..., Any]:
+    def wrapper(self: Flag, *args: Any) -> Any:
+        if not tracer._sampled():
+            return original(self, *args)
+        return tracer._call(self.__class__, operation, original, self, *args)
+
+    wrapper.__name__ = original.__name__
+    return wrapper
+
+
+_FLAG_OPERATIONS = {
+    '__or__': 'flag_or', '__and__': 'flag_and', '__xor__': 'flag_xor', '__invert__': 'flag_invert',
+    '__ror__': 'flag_or', '__rand__': 'flag_and', '__rxor__': 'flag_xor',
+}
+# targets, names of methods, operations they're recorded as and functions that wrap them
+_TRACED: List[Tuple[type, str, str, Callable[[Tracer, Callable[..., Any], str], Callable[..., Any]]]] = [
+    (EnumMeta, '__call__', 'value_lookup', _wrap_call),
+    (EnumMeta, '__getitem__', 'name_lookup', _wrap_class_method),
+    (EnumMeta, '__iter__', 'iteration', _wrap_iter),
+    *[
+        (flag_class, name, operation, _wrap_member_method)
+        for flag_class in (Flag, IntFlag)
+        for name, operation in _FLAG_OPERATIONS.items()
+        # Flag doesn't have reflected operators
+        if name in flag_class.__dict__
+    ],
+]
@@ -1,11 +1,17 @@
 from pathlib import Path
+import copy
+import os
+import pickle
+import platform
 import subprocess
 import sys
-from enum import Enum, EnumMeta, Flag
+from enum import Enum, EnumMeta, Flag, IntEnum, IntFlag
+from types import DynamicClassAttribute
 
 import pytest
 
 import fastenum
+from fastenum.parcher import PatchMeta
 from fastenum.patches import EnumPatch, EnumMetaPatch
 
 assert fastenum.enabled
@@ -47,6 +53,39 @@ def test_patched_enum():
     assert EnumMeta.__new__ is EnumMetaPatch.__to_update__['__new__']
 
 
+def test_disable_restores_subclasses():
+    def original(self):
+        return 'original'
+
+    class Base:
+        method = staticmethod(original)
+
+    class Redefined(Base):
+        pass
+
+    # same function, but not wrapped in staticmethod
+    Redefined.method = original
+
+    class Inherited(Base):
+        pass
+
+    # not in Patch.__subclasses__(), so fastenum.enable() doesn't apply it
+    class LocalPatch(metaclass=PatchMeta):
+        __run_on_class__ = __run_on_instance__ = __collect_instances__ = None
+
+    class BasePatch(LocalPatch, target=Base, update={'method'}):
+        def method(self):
+            return 'patched'
+
+    BasePatch.enable()
+    assert Inherited.method is Redefined.method is BasePatch.method
+    BasePatch.disable()
+
+    assert Redefined.__dict__['method'] is original
+    assert 'method' not in Inherited.__dict__
+    assert isinstance(Base.__dict__['method'], staticmethod)
+
+
 def test_non_named_members_have_attrs():
     assert fastenum.enabled
     fastenum.disable()
@@ -83,3 +122,962 @@ def test_builtin_tests(python):
         return pytest.skip(f'Unable to run test with {python}, {str(e)}')
 
     assert result.returncode == 0, f'Tests failed in {python}'
+
+
+def test_aliases():
+    class Foo(Enum):
+        a = 1
+        b = [1, 2]
+        c = 1
+        d = [1, 2]
+        e = 2
+
+    assert Foo.c is Foo.a
+    assert Foo.d is Foo.b
+    assert list(Foo) == [Foo.a, Foo.b, Foo.e]
+    assert list(Foo.__members__) == ['a', 'b', 'c', 'd', 'e']
+    assert Foo([1, 2]) is Foo.b
+
+
+def test_lazy_members():
+    init_calls = []
+
+    class Foo(Enum):
+        _lazy_ = True
+
+        a = 1
+        b = 2
+        c = 1
+        name = 3
+        d = 4
+
+        def __init__(self, *args):
+            init_calls.append(args)
+
+    assert len(Foo) == 4
+    assert Foo._member_names_ == ['a', 'b', 'name', 'd']
+    assert not init_calls
+
+    assert Foo.b.value == 2
+    assert Foo['c'] is Foo.a
+    assert Foo(4) is Foo.d
+    assert Foo.name.name == 'name'
+    assert init_calls == [(2,), (1,), (4,), (3,)]
+
+    assert list(Foo) == [Foo.a, Foo.b, Foo.name, Foo.d]
+    assert list(Foo.__members__) == ['a', 'b', 'c', 'name', 'd']
+    assert list(Foo._value2member_map_) == [1, 2, 3, 4]
+    assert type(Foo._member_map_) is dict
+
+
+def test_lazy_flag():
+    class Foo(Flag):
+        _lazy_ = True
+
+        a = 1
+        b = 2
+        c = 4
+
+    assert Foo(3) is Foo.a | Foo.b
+    assert repr(Foo(5)) == '<Foo.c|a: 5>'
+
+
+def test_pseudo_member_cache():
+    class Foo(Flag):
+        _pseudo_member_cache_size_ = 2
+
+        a = 1
+        b = 2
+        c = 4
+
+    ab = Foo.a | Foo.b
+    assert Foo.a | Foo.b is ab
+    Foo.a | Foo.c
+    Foo.b | Foo.c
+    assert 3 not in Foo._value2member_map_
+    assert Foo.a | Foo.b == ab
+    assert repr(ab) == '<Foo.b|a: 3>'
+
+    info = fastenum.pseudo_member_cache_info(Foo)['pseudo_members']
+    assert (info.hits, info.evictions, info.maxsize, info.currsize) == (1, 2, 2, 2)
+
+    fastenum.set_pseudo_member_cache_size(Foo, None)
+    assert fastenum.pseudo_member_cache_info(Foo) is None
+    assert 3 in Foo._value2member_map_
+
+
+def test_int_flag_pseudo_member_cache():
+    class Foo(IntFlag):
+        a = 1
+
+    fastenum.set_pseudo_member_cache_size(Foo, 1)
+    assert repr(Foo(13)) == '<Foo.8|4|a: 13>'
+    assert repr(Foo(7)) == '<Foo.4|2|a: 7>'
+    assert list(Foo._value2member_map_) == [1, 4, 8, 2]
+    assert repr(Foo(13)) == '<Foo.8|4|a: 13>'
+
+
+def test_bulk_conversion():
+    np = pytest.importorskip('numpy')
+
+    class Foo(Enum):
+        a = 1
+        b = 2
+        c = 3
+        d = 1000
+
+    class Bar(Flag):
+        a = 1
+        b = 2
+
+    class Baz(Enum):
+        a = 'a'
+        b = 'b'
+
+        @classmethod
+        def _missing_(cls, value):
+            return cls.b if value == 0 else None
+
+    values = np.array([[3, 1], [1000, 2]])
+    assert Foo.from_values(values).tolist() == [[Foo.c, Foo.a], [Foo.d, Foo.b]]
+    assert Foo.valid_mask([1, 4, 1000, -1]).tolist() == [True, False, True, False]
+    assert Foo.to_values([Foo.b, Foo.d]).tolist() == [2, 1000]
+    assert Bar.from_values([3, 1]).tolist() == [Bar.a | Bar.b, Bar.a]
+    assert Baz.from_values(['b', 'a']).tolist() == [Baz.b, Baz.a]
+    assert Baz.from_values([0]).tolist() == [Baz.b]
+
+    with pytest.raises(ValueError):
+        Foo.from_values([1, 5])
+    with pytest.raises(TypeError):
+        Foo.to_values([Foo.a, Bar.a])
+
+    # numpy would convert all values to strings
+    Mixed = Enum('Mixed', [('a', 1), ('b', 'a')])
+    assert Mixed.from_values(['a', 1]).tolist() == [Mixed('a'), Mixed(1)]
+    with pytest.raises(ValueError):
+        Mixed('1')
+    with pytest.raises(ValueError):
+        Mixed.from_values(['1'])
+    assert Mixed.valid_mask(['1', 'a', 1]).tolist() == [False, True, True]
+    assert Mixed.to_values([Mixed.a, Mixed.b]).tolist() == [1, 'a']
+
+
+def test_numpy_is_imported_lazily():
+    pytest.importorskip('numpy')
+    code = 'import sys, fastenum; fastenum.enabled or fastenum.enable(); print("numpy" in sys.modules)'
+    result = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, universal_newlines=True, check=True)
+    assert result.stdout.strip() == 'False'
+
+
+@pytest.mark.parametrize('scan_heap', [False, True])
+def test_enable_finds_existing_instances(scan_heap):
+    fastenum.disable()
+    try:
+        class Foo(Flag):
+            a = 1
+            b = 2
+
+        class Bar:
+            @DynamicClassAttribute
+            def attr(self):
+                return 1
+
+        pseudo_member = Foo(3)
+    finally:
+        fastenum.enable(scan_heap=scan_heap)
+
+    assert Foo.a.__dict__['name'] == 'a'
+    assert pseudo_member.__dict__['value'] == 3
+    assert Bar.__dict__['attr'].alias == '_cls_attr_attr'
+
+
+@pytest.mark.parametrize('env_value, expected', [('1', True), ('0', False), ('', False)])
+def test_autoenable_pth(env_value, expected):
+    pth = Path(__file__).parent.parent / 'fastenum-autoenable.pth'
+    code = (
+        pth.read_text()
+        + 'import sys, re, inspect\n'
+        + 'fastenum = sys.modules.get("fastenum")\n'
+        + 'print(fastenum is not None and fastenum.enabled)\n'
+        # stdlib enums imported afterwards are created by patched metaclass, not patched later
+        + 'print(fastenum is not None and fastenum.stats(re.RegexFlag).constructions == 1)\n'
+        + 'print(fastenum is not None and fastenum.stats(inspect._ParameterKind).constructions == 1)\n'
+    )
+    env = {**os.environ, 'FASTENUM_AUTOENABLE': env_value}
+    # -S to skip sitecustomize and any installed .pth files
+    result = subprocess.run(
+        [sys.executable, '-S', '-c', code], env=env, stdout=subprocess.PIPE, universal_newlines=True, check=True
+    )
+    assert result.stdout.split() == [str(expected)] * 3
+
+
+@pytest.mark.parametrize('base', [Flag, IntFlag])
+def test_compact_members(base):
+    class Foo(base):
+        _compact_ = True
+
+        a = 1
+        b = 2
+
+    pseudo_member = Foo(3)
+    assert list(vars(pseudo_member)) == list(vars(Foo.a))
+    assert pseudo_member.__objclass__ is Foo
+    assert repr(pseudo_member) == '<Foo.b|a: 3>'
+
+    if platform.python_implementation() == 'CPython':
+        # instance dicts share keys with each other
+        assert sys.getsizeof(vars(pseudo_member)) == sys.getsizeof(vars(Foo.a))
+
+
+class PickledByName(IntFlag):
+    _pickle_by_ = 'name'
+
+    a = 1
+    b = 2
+    c = 1
+
+
+class PickledTuple(tuple, Enum):
+    _pickle_by_ = 'name'
+
+    a = ('value', 1)
+    b = ('value', 2)
+
+
+class PickledBase(Enum):
+    _pickle_by_ = 'name'
+
+
+class PickledSubclass(PickledBase):
+    a = 'value' * 10
+
+
+class PickledSubclassByValue(PickledBase):
+    _pickle_by_ = 'value'
+
+    a = 'value' * 10
+
+
+@pytest.mark.parametrize('protocol', range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle_by(protocol):
+    for member in (PickledByName.a, PickledByName.c, PickledByName(3), PickledTuple.b):
+        assert pickle.loads(pickle.dumps(member, protocol)) is member
+
+    # payload doesn't include values
+    assert b'value' not in pickle.dumps(PickledTuple.b, protocol)
+
+    fastenum.set_pickle_by(PickledTuple, 'value')
+    try:
+        assert b'value' in pickle.dumps(PickledTuple.b, protocol)
+        assert pickle.loads(pickle.dumps(PickledTuple.b, protocol)) is PickledTuple.b
+    finally:
+        fastenum.set_pickle_by(PickledTuple, 'name')
+
+    with pytest.raises(ValueError):
+        fastenum.set_pickle_by(PickledTuple, 'id')
+
+    # subclasses inherit option of their base
+    assert b'value' not in pickle.dumps(PickledSubclass.a, protocol)
+    assert pickle.loads(pickle.dumps(PickledSubclass.a, protocol)) is PickledSubclass.a
+    assert b'value' in pickle.dumps(PickledSubclassByValue.a, protocol)
+    assert pickle.loads(pickle.dumps(PickledSubclassByValue.a, protocol)) is PickledSubclassByValue.a
+
+
+def test_build_enum():
+    Foo = fastenum.build_enum('Foo', {'a': 1, 'b': 2, 'c': 1}, namespace={'double': lambda self: self.value * 2})
+    assert list(Foo) == [Foo.a, Foo.b]
+    assert Foo.c is Foo.a
+    assert Foo(2) is Foo.b
+    assert Foo.b.double() == 4
+    assert Foo.__module__ == __name__
+
+    Bar = fastenum.build_enum('Bar', [('a', 1), ('b', 2)], base=IntFlag, qualname='Baz.Bar')
+    assert Bar.a | Bar.b == 3
+    assert Bar.__qualname__ == 'Baz.Bar'
+
+    Baz = fastenum.build_enum('Baz', [('a', 'x')], type=str)
+    assert Baz.a == 'x'
+    assert Baz.a.upper() == 'X'
+
+    with pytest.raises(TypeError, match='reuse key'):
+        fastenum.build_enum('Foo', [('a', 1), ('a', 2)])
+    with pytest.raises(ValueError, match='Invalid enum member name'):
+        fastenum.build_enum('Foo', {'_a_': 1})
+    with pytest.raises(TypeError, match='conflict'):
+        fastenum.build_enum('Foo', {'a': 1}, namespace={'a': property()})
+
+    initialized = []
+
+    class Meta(EnumMeta):
+        def __init__(cls, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            initialized.append(cls)
+
+    class Base(Enum, metaclass=Meta):
+        pass
+
+    Qux = fastenum.build_enum('Qux', {'a': 1}, base=Base)
+    assert initialized == [Base, Qux] and Qux(1) is Qux.a
+
+
+def test_value_lookup():
+    class Foo(Enum):
+        a = 1
+        b = [2]
+
+        @classmethod
+        def _missing_(cls, value):
+            return cls.a if value == 'a' else None
+
+    class Bar(str, Enum):
+        a = 'b'
+        b = 'a'
+
+    assert Foo(1) is Foo(Foo.a) is Foo('a') is Foo.a
+    assert Foo([2]) is Foo(Foo.b) is Foo.b
+    assert Bar('a') is Bar(Bar.b) is Bar.b
+    assert Bar(Bar.a) is Bar.a
+    with pytest.raises(ValueError, match="^3 is not a valid .*Foo$"):
+        Foo(3)
+    with pytest.raises(ValueError, match=r"^\[3\] is not a valid .*Foo$"):
+        Foo([3])
+
+
+def test_get_and_has_value():
+    class Foo(Enum):
+        a = 1
+        b = [2]
+
+    class Bar(Flag):
+        a = 1
+        b = 2
+
+    assert Foo.get(1) is Foo.get(Foo.a) is Foo.a
+    assert Foo.get([2]) is Foo.b
+    assert Foo.get(3) is None
+    assert Foo.get([3], 'default') == 'default'
+    assert Foo.has_value(1) and Foo.has_value([2])
+    assert not Foo.has_value(3) and not Foo.has_value({})
+
+    assert Bar.get(3) is Bar.a | Bar.b
+    assert Bar.get(4) is None
+    assert Bar.has_value(0)
+    assert not Bar.has_value(8)
+
+
+def test_get_with_static_missing():
+    class Foo(Enum):
+        a = 1
+
+        @staticmethod
+        def _missing_(value):
+            return Foo.a if value == 'a' else None
+
+    with pytest.raises(ValueError):
+        Foo(5)
+    assert Foo.get(5) is None and not Foo.has_value(5)
+    assert Foo.get('a') is Foo.a and Foo.has_value('a')
+
+
+def test_missing_cache():
+    calls = []
+
+    class Foo(Enum):
+        _missing_cache_size_ = 2
+
+        a = 'a'
+        b = 'b'
+
+        @classmethod
+        def _missing_(cls, value):
+            calls.append(value)
+            if value in (1, True):
+                raise KeyError(value)
+            return cls._value2member_map_.get(value.lower())
+
+    assert Foo('A') is Foo('A') is Foo.a
+    assert Foo.get('C') is Foo.get('C') is None
+    assert calls == ['A', 'C']
+
+    assert Foo('B') is Foo.b
+    assert Foo.get('A') is Foo.a
+    assert calls == ['A', 'C', 'B', 'A']  # least recently used value was evicted
+
+    with pytest.raises(KeyError):
+        Foo(1)
+    with pytest.raises(KeyError):
+        Foo(True)
+    assert calls[-2:] == [1, True]  # errors are not cached
+
+    info = fastenum.missing_cache_info(Foo)
+    assert (info.maxsize, info.currsize) == (2, 2)
+
+    # new pseudo-member changes the map, so results are forgotten
+    Foo._value2member_map_['c'] = Foo.a
+    assert Foo('C') is Foo.a
+    assert calls[-1] == 'C'
+
+    fastenum.set_missing_cache_size(Foo, None)
+    assert fastenum.missing_cache_info(Foo) is None
+    Foo('A')
+    Foo('A')
+    assert calls[-2:] == ['A', 'A']
+
+
+def test_lazy_missing_cache():
+    calls = []
+
+    class Foo(Enum):
+        _lazy_ = True
+        _missing_cache_size_ = 8
+
+        a = 'a'
+        b = 'b'
+
+        @classmethod
+        def _missing_(cls, value):
+            calls.append(value)
+
+    assert Foo.get('c') is Foo.get('c') is None
+    assert calls == ['c']
+    # misses don't create pending members
+    assert dict.__len__(Foo._member_map_) == 0
+    assert Foo('a') is Foo.a
+
+
+def test_indexes():
+    class Foo(IntEnum):
+        _indexes_ = {
+            'lower_name': lambda member: member.name.lower(),
+            'str': lambda member: str(member.value),
+            'label': 'label',
+        }
+
+        A = 1, 'first'
+        B = 2, 'second'
+        C = 3, 'first'
+
+        def __new__(cls, value, label):
+            member = int.__new__(cls, value)
+            member._value_ = value
+            member.label = label
+            return member
+
+    assert Foo.lookup('lower_name', 'b') is Foo.B
+    assert Foo.lookup('str', '3') is Foo.C
+    assert Foo.lookup('label', 'first') is Foo.A
+    assert Foo.lookup('label', 'third', None) is None
+    with pytest.raises(KeyError):
+        Foo.lookup('str', 3)
+    with pytest.raises(ValueError, match='no index'):
+        Foo.lookup('name', 'A')
+
+    fastenum.add_index(Foo, 'label', lambda member: member.label.upper())
+    assert Foo.lookup('label', 'SECOND') is Foo.B
+
+    class Bar(Enum):
+        _lazy_ = True
+        _indexes_ = {'str': lambda member: str(member.value)}
+
+        a = 1
+        b = 2
+
+    assert Bar.lookup('str', '2') is Bar.b
+
+
+def test_value_freezer():
+    from dataclasses import dataclass
+
+    @dataclass
+    class Point:
+        x: int
+        y: int
+
+    class Config(Enum):
+        _value_freezer_ = True
+
+        LIST = [1, 2]
+        TUPLE = (1, 2)
+        DICT = {'a': [1], 'b': {2}}
+        POINT = Point(1, 2)
+        SET = frozenset({3})
+        ALIAS = [1, 2]
+
+    assert Config.ALIAS is Config.LIST
+    assert Config([1, 2]) is Config.LIST
+    assert Config((1, 2)) is Config.TUPLE
+    assert Config({'b': {2}, 'a': [1]}) is Config.DICT
+    assert Config(Point(1, 2)) is Config.POINT
+    assert Config({3}) is Config.SET
+    assert Config.get([2, 1]) is None
+    assert not Config.has_value({'a': [1]})
+    with pytest.raises(ValueError):
+        Config(Point(2, 1))
+
+    class Custom(Enum):
+        A = [1, 2]
+        B = [3, 4]
+
+    fastenum.set_value_freezer(Custom, lambda value: tuple(value) if isinstance(value, list) else fastenum.freeze(value))
+    assert Custom([3, 4]) is Custom.B
+    assert Custom.get({}) is None
+    fastenum.set_value_freezer(Custom, None)
+    assert Custom([3, 4]) is Custom.B
+
+
+def test_identity_hash():
+    class Color(Enum):
+        RED = 1
+        GREEN = 2
+        CRIMSON = 1
+
+    class Str(str, Enum):
+        A = 'a'
+
+    class Named(Enum):
+        A = 1
+
+        def __eq__(self, other):
+            return self.name == getattr(other, 'name', other)
+
+        __hash__ = Enum.__hash__
+
+    class Perm(Flag):
+        R = 1
+        W = 2
+
+    assert Color.__hash__ is object.__hash__
+    assert {Color.RED: 'red'}[Color.CRIMSON] == 'red'
+    assert hash(Str.A) == hash('a')
+    assert {'a': 1}[Str.A] == 1
+    assert hash(Named.A) == hash('A')
+    assert Perm.__hash__ is Enum.__hash__
+
+
+def test_flag_operators():
+    class Perm(Flag):
+        _pseudo_member_cache_size_ = 2
+
+        R = 1
+        W = 2
+        X = 4
+        RX = 5
+
+    assert Perm.R | Perm.W is Perm(3)
+    assert Perm.RX & Perm.X is Perm.X
+    assert Perm.RX ^ Perm.R is Perm.X
+    assert ~Perm.R is Perm(6)
+    assert ~Perm.W is Perm.RX
+    assert ~Perm(0) is Perm(7)
+    assert Perm.R | Perm.W | Perm.X == Perm(7)
+    with pytest.raises(TypeError):
+        Perm.R | 1
+
+    class Mode(IntFlag):
+        R = 4
+        W = 2
+
+    assert Mode.R | 2 is 2 | Mode.R is Mode(6)
+    assert Mode.R & 4 is Mode.R
+    assert 6 ^ Mode.W is Mode.R
+    assert ~Mode.R == -5 and isinstance(~Mode.R, Mode)
+    with pytest.raises(TypeError):
+        Mode.R | 'a'
+
+
+def test_flag_decomposition():
+    class Perm(Flag):
+        R = 1
+        W = 2
+        X = 4
+        RX = 5
+
+    class Mode(IntFlag):
+        A = 1
+        BC = 6
+
+    assert repr(Perm(7)) == '<Perm.RX|X|W|R: 7>'
+    assert str(Perm(3)) == 'Perm.W|R'
+    assert str(Perm(3)) == 'Perm.W|R'  # cached decomposition
+    assert repr(Mode(15)) == '<Mode.8|BC|A: 15>'
+    assert repr(Mode(10)) == '<Mode.8|2: 10>'
+    assert repr(Mode(-1)) == '<Mode.BC|A: -1>'
+
+
+def test_cached_strings():
+    class Color(Enum):
+        RED = 1
+        GREEN = 2
+
+    class Num(IntEnum):
+        ONE = 1
+
+    counter = iter(range(10))
+
+    class Dynamic(Enum):
+        A = 1
+
+        def __str__(self):
+            return str(next(counter))
+
+    assert repr(Color.RED) == repr(Color.RED) == '<Color.RED: 1>'
+    assert str(Color.RED) == f'{Color.RED}' == 'Color.RED'
+    assert f'{Num.ONE}' == '1' and f'{Num.ONE:>3}' == '  1'
+    assert (f'{Dynamic.A}', f'{Dynamic.A}') == ('0', '1')
+
+    Color.__name__ = 'Colour'
+    assert repr(Color.RED) == '<Colour.RED: 1>'
+    Color.GREEN._name_ = 'LIME'
+    assert (str(Color.GREEN), Color.GREEN.name) == ('Colour.LIME', 'LIME')
+
+    class Perm(Flag):
+        R = 1
+        W = 2
+
+    assert str(Perm.R | Perm.W) == 'Perm.W|R'
+    Perm.R._name_ = 'READ'
+    assert str(Perm.R | Perm.W) == 'Perm.W|READ'
+
+    class Unhashable(Enum):
+        A = [1]
+        B = 2
+
+    # rendered directly, without trying to find value in caches
+    assert Unhashable._repr_cache_ is Unhashable._str_cache_ is Unhashable._format_cache_ is None
+    assert repr(Unhashable.A) == '<Unhashable.A: [1]>'
+    assert (str(Unhashable.B), f'{Unhashable.A}') == ('Unhashable.B', 'Unhashable.A')
+
+    lazy = fastenum.build_enum('Lazy', {'a': [1], 'b': 2}, namespace={'_lazy_': True})
+    assert lazy._repr_cache_ is None and repr(lazy.a) == '<Lazy.a: [1]>'
+
+
+def test_json_encoding():
+    import json
+    from fastenum.encoding import JSONEncoder, default, object_hook, to_members
+
+    class Color(Enum):
+        RED = 'red'
+        GREEN = 'green'
+
+    class Perm(Flag):
+        R = 1
+        W = 2
+
+    payload = {'color': Color.RED, 'colors': [Color.GREEN, Color.RED], 'perm': Perm.R | Perm.W, 'nested': [{'color': None}]}
+    data = json.dumps(payload, default=default)
+    assert data == json.dumps(payload, cls=JSONEncoder)
+    assert json.loads(data) == {'color': 'red', 'colors': ['green', 'red'], 'perm': 3, 'nested': [{'color': None}]}
+    with pytest.raises(TypeError, match='not JSON serializable'):
+        json.dumps(object(), default=default)
+
+    hook = object_hook({'color': Color, 'colors': [Color], 'perm': Perm})
+    assert json.loads(data, object_hook=hook) == payload
+    with pytest.raises(ValueError):
+        json.loads('{"color": "blue"}', object_hook=hook)
+    assert to_members(Perm, iter([1, 3])) == [Perm.R, Perm.R | Perm.W]
+
+
+def test_concurrent_use():
+    import threading
+
+    class Perm(Flag):
+        R = 1
+        W = 2
+
+    errors = []
+    stop = threading.Event()
+
+    def use_enums():
+        while not stop.is_set():
+            try:
+                assert Perm(1) is Perm.R and Perm['W'].value == 2
+                assert str(Perm.R | Perm.W) == 'Perm.W|R'
+            except Exception as e:
+                errors.append(e)
+
+    def use_lazy(enum_class, barrier):
+        barrier.wait()
+        try:
+            for i in range(100):
+                assert enum_class(i).value == i
+        except Exception as e:
+            errors.append(e)
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=use_enums) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for _ in range(20):
+            fastenum.disable()
+            fastenum.enable()
+        stop.set()
+
+        for _ in range(5):
+            lazy = fastenum.build_enum('Lazy', {f'M{i}': i for i in range(100)}, namespace={'_lazy_': True})
+            barrier = threading.Barrier(3)
+            threads += [threading.Thread(target=use_lazy, args=(lazy, barrier)) for _ in range(3)]
+            for thread in threads[-3:]:
+                thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert not errors
+
+
+def _toggle_while(*targets, times=20):
+    import threading
+
+    errors = []
+    stop = threading.Event()
+
+    def run(target):
+        while not stop.is_set():
+            try:
+                target()
+            except Exception as e:
+                errors.append(e)
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=run, args=(target,)) for target in targets]
+        for thread in threads:
+            thread.start()
+        for _ in range(times):
+            fastenum.disable()
+            fastenum.enable()
+        stop.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    return errors
+
+
+def test_enable_disable_are_atomic():
+    import enum
+
+    targets = (DynamicClassAttribute, Enum, Enum, EnumMeta, EnumMeta, Flag, IntFlag, enum)
+    names = ('__get__', '__new__', '__repr__', '__call__', '__iter__', '__or__', '__or__', '_decompose')
+    patched = tuple(map(getattr, targets, names))
+    fastenum.disable()
+    original = tuple(map(getattr, targets, names))
+    fastenum.enable()
+    assert not set(patched) & set(original)
+    observed = set()
+
+    def observe():
+        # map() reads all attributes in C, so threads can't switch in between
+        observed.add(tuple(map(getattr, targets, names)))
+
+    assert not _toggle_while(observe, observe)
+    assert observed <= {patched, original}
+    assert {patched, original} <= observed, 'both directions must be observed'
+
+
+def test_lookups_during_enable_disable():
+    class Color(Enum):
+        RED = 1
+        GREEN = 2
+
+    class Perm(IntFlag):
+        R = 4
+        W = 2
+
+    def lookup():
+        assert Color(1) is Color.RED and Color['GREEN'] is Color.GREEN
+        assert Color.RED.name == 'RED' and Color.GREEN.value == 2
+        assert str(Color.RED) == 'Color.RED' and repr(Color.GREEN) == '<Color.GREEN: 2>'
+        assert list(Color) == [Color.RED, Color.GREEN] and Color.RED in Color
+        assert Perm(6) is Perm.R | Perm.W and (Perm.R | Perm.W).value == 6
+
+    assert not _toggle_while(lookup, lookup)
+
+
+def test_class_defined_before_commit():
+    from fastenum.parcher import InstancePatch, Patch, Swap
+
+    fastenum.disable()
+    swap = Swap()
+    Patch.enable_patches(swap=swap)
+    InstancePatch.enable_patches(swap=swap)
+    # as if other thread defined it after patches were collected
+    New = Enum('New', 'A B')
+    swap.commit()
+    fastenum.enabled = True
+
+    assert New(1) is New.A and New['B'].value == 2 and New.A.name == 'A'
+    assert list(New) == [New.A, New.B] and str(New.B) == 'New.B'
+
+
+def test_stats():
+    class Foo(Enum):
+        a = [1]
+        b = 'b'
+
+        @classmethod
+        def _missing_(cls, value):
+            return cls.b if value == 'B' else None
+
+    class Perm(Flag):
+        R = 1
+        W = 2
+
+    stats = fastenum.stats(Foo)
+    assert stats.constructions == 1 and stats.construction_time > 0
+    assert Foo in fastenum.stats() and Perm in fastenum.stats()
+
+    assert Foo('b') is Foo(Foo.b) is Foo.b  # the first one doesn't reach Enum.__new__
+    assert Foo.get('b') is Foo.b and Foo.has_value('b')
+    assert Foo([1]) is Foo.a
+    assert Foo('B') is Foo.b
+    assert Foo.get('c') is None
+    with pytest.raises(ValueError):
+        Foo('c')
+    assert str(Perm.R | Perm.W) == 'Perm.W|R'
+
+    stats = fastenum.stats(Foo)
+    # successful lookups aren't counted by default
+    assert (stats.fast_hits, stats.new_hits) == (0, 0)
+    assert (stats.linear_scans, stats.missing_calls, stats.missing_misses) == (1, 3, 2)
+    stats = fastenum.stats(Perm)
+    assert stats.pseudo_members == 1 and stats.decompose_calls >= 1
+
+    class E(Enum):
+        a = 1
+
+    fastenum.set_hit_counting(True)
+    try:
+        # hits of the fast path are counted too
+        assert E(1) is E.a
+        assert fastenum.stats(E).fast_hits == 1
+        fastenum.reset_stats(E)
+        assert E(1) is E(E.a) is E.get(1) is E.a and E.has_value(1)
+        assert (fastenum.stats(E).fast_hits, fastenum.stats(E).new_hits) == (3, 1)
+    finally:
+        fastenum.set_hit_counting(False)
+    assert E(1) is E.a
+    assert fastenum.stats(E).fast_hits == 3
+
+    fastenum.reset_stats(Foo)
+    assert fastenum.stats(Foo) == (0,) * len(fastenum.stats(Foo))
+    assert Foo not in fastenum.stats() and Perm in fastenum.stats()
+    fastenum.reset_stats()
+    assert Perm not in fastenum.stats()
+
+
+def test_trace():
+    class Perm(Flag):
+        R = 1
+        W = 2
+
+    call, or_ = EnumMeta.__dict__['__call__'], Flag.__dict__['__or__']
+    with fastenum.trace() as tracer:
+        assert Perm(1) is Perm['R'] is Perm.R
+        with pytest.raises(ValueError):
+            Perm(4)
+        assert list(Perm) == [Perm.R, Perm.W]
+        assert Perm.R | Perm.W is Perm(3)
+        with pytest.raises(RuntimeError):
+            fastenum.trace().__enter__()
+    assert EnumMeta.__dict__['__call__'] is call and Flag.__dict__['__or__'] is or_
+
+    # including lookup of pseudo-member by flag_or
+    assert tracer.histograms[Perm, 'value_lookup'].count == 4
+    assert tracer.histograms[Perm, 'name_lookup'].count == 1
+    assert tracer.histograms[Perm, 'iteration'].count >= 1  # flags iterate over themselves, too
+    assert tracer.histograms[Perm, 'flag_or'].count == 1
+    assert set(tracer.to_json()[f'{__name__}.{Perm.__qualname__}']) == {
+        'value_lookup', 'name_lookup', 'iteration', 'flag_or',
+    }
+    stacks = [line.rsplit(' ', 1)[0] for line in tracer.to_collapsed().splitlines()]
+    name = f'{__name__}.{Perm.__qualname__}'.replace(' ', '_')
+    assert f'enum;{name};value_lookup' in stacks
+    assert f'enum;{name};flag_or' in stacks
+    assert f'enum;{name};flag_or;{name};value_lookup' in stacks
+
+    with fastenum.trace(sample_every=2) as tracer:
+        for _ in range(10):
+            Perm(1)
+    assert tracer.histograms[Perm, 'value_lookup'].count == 5
+
+
+def test_member_sequences():
+    class Foo(Enum):
+        b = object()
+        a = object()
+        c = b
+
+    assert [m._ordinal_ for m in Foo] == [0, 1]
+    assert Foo._members_ == (Foo.b, Foo.a) and Foo._values_ == (Foo.b.value, Foo.a.value)
+    assert list(reversed(Foo)) == [Foo.a, Foo.b]
+    assert Foo.by_index(1) is Foo.by_index(-1) is Foo.a
+    with pytest.raises(IndexError):
+        Foo.by_index(2)
+    # total order for members that aren't comparable otherwise
+    assert sorted([Foo.a, Foo.b], key=lambda m: m._ordinal_) == [Foo.b, Foo.a]
+
+    lazy = fastenum.build_enum('Lazy', {'x': 1, 'y': 2, 'z': 1}, namespace={'_lazy_': True})
+    assert lazy.y._ordinal_ == 1 and lazy._members_ is None
+    assert lazy.by_index(0) is lazy.x and lazy._members_ == (lazy.x, lazy.y)
+
+    if platform.python_implementation() == 'CPython':
+        class Plain:
+            def __init__(self):
+                # same keys in the same order as patched members have
+                self.value = self._value_ = 1
+                self.name = self._name_ = 'a'
+                self.__objclass__ = Plain
+
+        # ordinals don't stop members from sharing keys of instance dicts
+        Plain()
+        assert sys.getsizeof(vars(Foo.a)) == sys.getsizeof(vars(Plain()))
+
+
+def test_containers():
+    from fastenum.containers import EnumMap, EnumSet
+
+    class Foo(Enum):
+        c = 3
+        a = 1
+        b = 2
+        d = 1
+
+    foo_set = EnumSet(Foo, [Foo.b, Foo.c])
+    assert list(foo_set) == [Foo.c, Foo.b] and len(foo_set) == 2  # definition order
+    assert Foo.b in foo_set and Foo.a not in foo_set and 2 not in foo_set
+    assert foo_set | EnumSet(Foo, [Foo.d]) == EnumSet.all(Foo) == {Foo.a, Foo.b, Foo.c}
+    assert foo_set & EnumSet(Foo, [Foo.b]) == {Foo.b} == foo_set - {Foo.c}
+    assert foo_set ^ EnumSet.all(Foo) == ~foo_set == EnumSet(Foo, [Foo.a])
+    assert foo_set | {Foo.a} == {Foo.a} | foo_set == EnumSet.all(Foo)
+    assert EnumSet(Foo, [Foo.b]) < foo_set <= foo_set and not foo_set < foo_set
+    foo_set.add(Foo.a)
+    foo_set.discard(Foo.c)
+    assert foo_set == {Foo.a, Foo.b} == copy.deepcopy(foo_set)
+    with pytest.raises(TypeError):
+        foo_set.add(1)
+
+    foo_map = EnumMap(Foo, {Foo.b: 'b'})
+    foo_map[Foo.d] = 'a'
+    assert list(foo_map.items()) == [(Foo.a, 'a'), (Foo.b, 'b')] and len(foo_map) == 2
+    assert foo_map[Foo.a] == foo_map.get(Foo.a) == 'a' and foo_map.get(Foo.c, 'c') == 'c'
+    assert Foo.b in foo_map and Foo.c not in foo_map and 2 not in foo_map
+    assert foo_map == {Foo.a: 'a', Foo.b: 'b'} and foo_map == copy.deepcopy(foo_map)
+    del foo_map[Foo.a]
+    assert dict(foo_map) == {Foo.b: 'b'}
+    with pytest.raises(KeyError):
+        foo_map[Foo.a]
+    with pytest.raises(KeyError):
+        del foo_map[2]
+    with pytest.raises(TypeError):
+        foo_map[2] = 'b'
+
+    class Perm(Flag):
+        R = 1
+        W = 2
+
+    with pytest.raises(ValueError):
+        EnumSet(Perm, [Perm.R | Perm.W])